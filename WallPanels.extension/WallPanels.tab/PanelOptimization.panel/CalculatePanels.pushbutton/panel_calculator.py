@@ -2,17 +2,25 @@
 
 from __future__ import print_function
 import os
+import sys
 import csv
+import errno
 import json
 import math
+import operator
+import shutil
+import re
+import bisect
+import contextlib
+from collections import namedtuple
 from datetime import datetime
 import io
 
-# Provide Py2/Py3 compatibility for type checks when run outside IronPython
+# Optional: process pool for the standalone CLI (not available in IronPython)
 try:
-    basestring
-except NameError:
-    basestring = (str,)
+    from concurrent.futures import ProcessPoolExecutor
+except ImportError:
+    ProcessPoolExecutor = None
 
 # ------------------ ANSI COLOR HELPERS ------------------
 class Ansi(object):
@@ -70,6 +78,10 @@ class Opening(object):
         
         self.force_blocker = False
 
+        # Type test done once here; is_storefront_like() reads it every pass.
+        otype_lower = self.type.lower()
+        self.storefront_like = ("storefront" in otype_lower) or ("curtain" in otype_lower)
+
     @property
     def left_clearance_zone(self):
         # Never allow clearance zones to extend past wall start
@@ -103,6 +115,8 @@ DIMENSION_INCREMENT = 1
 def snap_down(value, inc):
     try:
         value = float(value)
+        # Whole-inch grid (the default increment): skip the conversion and rescale.
+        if inc == 1: return value // 1.0
         inc = float(inc)
         return (value // inc) * inc
     except Exception:
@@ -148,11 +162,12 @@ class OptimizerConfig(object):
                  door_clearances=None, window_clearances=None,
                  storefront_clearances=None, optimization_strategy=None):
         self.project_name = project_name
-        self.panel_constraints = panel_constraints or PanelConstraints()
-        self.door_clearances = door_clearances or OpeningClearances()
-        self.window_clearances = window_clearances or OpeningClearances()
-        self.storefront_clearances = storefront_clearances or OpeningClearances()
-        self.optimization_strategy = optimization_strategy or OptimizationStrategy()
+        # Fresh defaults per config: the editors change these objects in place
+        self.panel_constraints = panel_constraints if panel_constraints is not None else PanelConstraints()
+        self.door_clearances = door_clearances if door_clearances is not None else OpeningClearances()
+        self.window_clearances = window_clearances if window_clearances is not None else OpeningClearances()
+        self.storefront_clearances = storefront_clearances if storefront_clearances is not None else OpeningClearances()
+        self.optimization_strategy = optimization_strategy if optimization_strategy is not None else OptimizationStrategy()
 
     def to_dict(self):
         return {
@@ -190,12 +205,7 @@ class OptimizerConfig(object):
 
 
     def save(self, filepath):
-        try:
-            f = io.open(filepath, "w", newline="")
-        except TypeError:
-            f = open(filepath, "w")
-
-        with f:
+        with io.open(filepath, "w", newline="", encoding="utf-8") as f:
             json.dump(self.to_dict(), f, indent=2)
 
         print("{} Config saved: {}{}".format(Ansi.GREEN, filepath, Ansi.RESET))
@@ -207,75 +217,143 @@ class OptimizerConfig(object):
         return cls.from_dict(data)
 
 
-def get_preset_configs():
-    presets = {}
-    presets["vertical"] = OptimizerConfig(
-        project_name="Vertical Panels",
-        panel_constraints=PanelConstraints(
+# Preset values as plain data. Configs get edited in place (CLI editors, the
+# pushbutton), so every call builds fresh objects from these templates.
+_PRESET_SPECS = {
+    "vertical": {
+        "project_name": "Vertical Panels",
+        "panel_constraints": dict(
             min_width=24, max_width=138, min_height=24, max_height=348.0,
             short_max=138, long_max=348.0, dimension_increment=1, panel_spacing=0.125
         ),
-        door_clearances=OpeningClearances(6, 8, 6),
-        window_clearances=OpeningClearances(4, 6, 4),
-        storefront_clearances=OpeningClearances(0.75, 0.75, 0.75),
-        optimization_strategy=OptimizationStrategy(True, True, True, True, "vertical")
-    )
-    presets["horizontal"] = OptimizerConfig(
-        project_name="Horizontal Panels",
-        panel_constraints=PanelConstraints(
+        "door_clearances": (6, 8, 6),
+        "window_clearances": (4, 6, 4),
+        "storefront_clearances": (0.75, 0.75, 0.75),
+        "optimization_strategy": (True, True, True, True, "vertical"),
+    },
+    "horizontal": {
+        "project_name": "Horizontal Panels",
+        "panel_constraints": dict(
             min_width=12, max_width=348.0, min_height=12, max_height=138,
             short_max=138, long_max=348.0, dimension_increment=1, panel_spacing=0.125
         ),
-        door_clearances=OpeningClearances(6, 8, 6),
-        window_clearances=OpeningClearances(6, 8, 6),
-        storefront_clearances=OpeningClearances(0.75, 0.75, 0.75),
-        optimization_strategy=OptimizationStrategy(False, True, False, True, "horizontal")
+        "door_clearances": (6, 8, 6),
+        "window_clearances": (6, 8, 6),
+        "storefront_clearances": (0.75, 0.75, 0.75),
+        "optimization_strategy": (False, True, False, True, "horizontal"),
+    },
+}
+
+def get_preset_config(name):
+    """Fresh OptimizerConfig for one preset ("vertical" or "horizontal")."""
+    spec = _PRESET_SPECS[name]
+    return OptimizerConfig(
+        project_name=spec["project_name"],
+        panel_constraints=PanelConstraints(**spec["panel_constraints"]),
+        door_clearances=OpeningClearances(*spec["door_clearances"]),
+        window_clearances=OpeningClearances(*spec["window_clearances"]),
+        storefront_clearances=OpeningClearances(*spec["storefront_clearances"]),
+        optimization_strategy=OptimizationStrategy(*spec["optimization_strategy"])
     )
-    return presets
+
+def get_preset_configs():
+    """Fresh {name: OptimizerConfig} for every preset. Deliberately not cached:
+    callers edit the returned configs in place. Prefer get_preset_config(name)."""
+    return dict((name, get_preset_config(name)) for name in _PRESET_SPECS)
 
 
 # =============================================================================
 # SECTION 2: DATA LOADING & VALIDATION (CSV-based)
 # =============================================================================
 
-def read_csv_rows(path):
-    if not os.path.exists(path): return []
-    rows = []
-    with open(path, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader: rows.append(row)
-    return rows
+# Files at least this big go through pyarrow when it is installed; below this
+# its import and setup cost more than the faster parse saves. pyarrow is only
+# imported once a file this big turns up.
+ARROW_MIN_BYTES = 1 << 20
+
+# Read buffer for the csv fallback: a few large reads instead of many 8 KB ones
+CSV_READ_BUFFER = 1 << 20
+
+
+def _read_csv_rows_arrow(path):
+    """All rows as {header: str} dicts, like csv.DictReader, parsed by pyarrow.
+    None when pyarrow is not installed (e.g. IronPython)."""
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        return None
+    with io.open(path, "r", encoding="utf-8-sig", newline="") as f:
+        header = next(csv.reader(f), None)
+    if not header: return []
+    # Every column as string so the row parsers see exactly what DictReader gives
+    table = pa_csv.read_csv(path, convert_options=pa_csv.ConvertOptions(
+        column_types=dict((name, pa.string()) for name in header),
+        strings_can_be_null=False))
+    return table.to_pylist()
+
+
+def read_csv_rows(path, missing_ok=True):
+    """Yield CSV rows as dicts. A missing file yields nothing, or raises
+    IOError (ENOENT) when missing_ok is False; the open itself is the check."""
+    try: big = os.path.getsize(path) >= ARROW_MIN_BYTES
+    except OSError: big = False
+    if big:
+        try:
+            rows = _read_csv_rows_arrow(path)
+        except Exception:
+            rows = None  # ragged rows, odd quoting: leave it to csv
+        if rows is not None:
+            for row in rows: yield row
+            return
+    try:
+        # The exporter writes UTF-8 (utf-8-sig also eats an Excel BOM); newline="" for csv
+        f = io.open(path, "r", buffering=CSV_READ_BUFFER, encoding="utf-8-sig", newline="")
+    except IOError as e:
+        if missing_ok and e.errno == errno.ENOENT: return
+        raise
+    with f:
+        for row in csv.DictReader(f): yield row
+
+
+# Typed rows produced once at load time; dimensions are already in inches.
+WallRow = namedtuple("WallRow", "wall_id length_in height_in")
+OpeningRow = namedtuple("OpeningRow", "opening_id opening_type host_wall_id x_in y_in w_in h_in")
 
 
 def load_walls_from_csv(walls_csv):
-    if not os.path.exists(walls_csv):
-        raise IOError("Walls CSV not found: {}".format(walls_csv))
-    rows = read_csv_rows(walls_csv)
+    """Typed wall rows; raises IOError if the file is missing."""
+    rows = [parse_wall_row(r) for r in read_csv_rows(walls_csv, missing_ok=False)]
     print(Ansi.CYAN + "[INFO] Loaded {} walls from CSV".format(len(rows)) + Ansi.RESET)
     return rows
 
 
-def load_openings_from_csv(openings_csv):
-    if not os.path.exists(openings_csv):
+def load_openings_from_csv(openings_csv, missing_ok=True):
+    """Typed opening rows; a missing file gives [] (or IOError if not missing_ok)."""
+    rows = []
+    try:
+        for r in read_csv_rows(openings_csv, missing_ok=False):
+            nr = {}
+            for k, v in r.items():
+                nk = k.strip() if isinstance(k, str) else k
+                nr[nk] = v
+            rows.append(parse_opening_row(nr))
+    except IOError as e:
+        if not missing_ok or e.errno != errno.ENOENT: raise
         print(Ansi.YELLOW + "[WARN] Openings CSV not found." + Ansi.RESET)
         return []
-    rows = read_csv_rows(openings_csv)
-    norm_rows = []
-    for r in rows:
-        nr = {}
-        for k, v in r.items():
-            nk = k.strip() if isinstance(k, basestring) else k
-            nr[nk] = v
-        norm_rows.append(nr)
-    print(Ansi.CYAN + "[INFO] Loaded {} openings from CSV".format(len(norm_rows)) + Ansi.RESET)
-    return norm_rows
+    print(Ansi.CYAN + "[INFO] Loaded {} openings from CSV".format(len(rows)) + Ansi.RESET)
+    return rows
 
 
+# Cell text that counts as blank (compared after strip().lower())
+_EMPTY_MARKERS = frozenset(("", "nan", "none"))
+
 def _is_empty(v):
     if v is None: return True
-    if isinstance(v, basestring):
+    if isinstance(v, str):
         s = v.strip()
-        return s == "" or s.lower() == "nan" or s.lower() == "none"
+        return s.lower() in _EMPTY_MARKERS
     try:
         return math.isnan(float(v))
     except Exception:
@@ -309,34 +387,58 @@ def get_wall_dimensions(wall_row):
     except Exception: return None
 
 
-def get_wall_openings(wall_id, openings_rows, door_clearances, window_clearances, storefront_clearances):
-    if not openings_rows: return []
+def parse_wall_row(wall_row):
+    """Convert a walls.csv dict row into a WallRow (zero dims if unusable)."""
+    length_in, height_in = get_wall_dimensions(wall_row) or (0.0, 0.0)
+    return WallRow(get_wall_id(wall_row), length_in, height_in)
+
+
+def parse_opening_row(row):
+    """Convert a wall_openings.csv dict row into an OpeningRow (inches)."""
+    width_ft = safe_float(row.get("Width(ft)", 0))
+    height_ft = safe_float(row.get("Height(ft)", 0))
+    sill_ft = safe_float(row.get("SillHeight(ft)", 0))
+
+    left_ft = safe_float(row.get("LeftEdgeAlongWall(ft)", 0))
+    if left_ft == 0 and "PositionAlongWall(ft)" in row:
+         pos = safe_float(row.get("PositionAlongWall(ft)", 0))
+         if pos != 0: left_ft = pos - (width_ft/2.0)
+
+    return OpeningRow(
+        row.get("OpeningId", ""),
+        str(row.get("OpeningType", "Unknown")),
+        safe_float(row.get("HostWallId"), None),
+        float(left_ft * 12),
+        float(sill_ft * 12),
+        float(width_ft * 12),
+        float(height_ft * 12)
+    )
+
+
+def index_openings_by_wall(openings_rows):
+    """Group OpeningRows by host wall id in one pass (wall id -> [rows])."""
+    openings_by_wall = {}
+    for r in openings_rows or []:
+        if r.host_wall_id is None: continue
+        openings_by_wall.setdefault(r.host_wall_id, []).append(r)
+    return openings_by_wall
+
+
+def get_wall_openings(wall_id, openings_by_wall, door_clearances, window_clearances, storefront_clearances):
+    """Build Opening objects for one wall from an index_openings_by_wall() dict."""
+    if not openings_by_wall: return []
     try:
         wall_id_int = int(float(wall_id))
     except Exception: return []
     
-    wall_openings = [r for r in openings_rows if safe_float(r.get("HostWallId"), None) == wall_id_int]
+    wall_openings = openings_by_wall.get(wall_id_int)
     if not wall_openings: return []
 
     openings = []
     for row in wall_openings:
-        width_ft = safe_float(row.get("Width(ft)", 0))
-        height_ft = safe_float(row.get("Height(ft)", 0))
-        sill_ft = safe_float(row.get("SillHeight(ft)", 0))
-        
-        if width_ft <= 0 or height_ft <= 0: continue
-        
-        left_ft = safe_float(row.get("LeftEdgeAlongWall(ft)", 0))
-        if left_ft == 0 and "PositionAlongWall(ft)" in row:
-             pos = safe_float(row.get("PositionAlongWall(ft)", 0))
-             if pos != 0: left_ft = pos - (width_ft/2.0)
-
-        x_in = float(left_ft * 12)
-        y_in = float(sill_ft * 12)
-        w_in = float(width_ft * 12)
-        h_in =float(height_ft * 12)
+        if row.w_in <= 0 or row.h_in <= 0: continue
         
-        opening_type = str(row.get("OpeningType", "Unknown"))
+        opening_type = row.opening_type
         otype_lower = opening_type.lower()
 
         if "door" in otype_lower:
@@ -347,7 +449,7 @@ def get_wall_openings(wall_id, openings_rows, door_clearances, window_clearances
         else:
             clearances = window_clearances
 
-        openings.append(Opening(row.get("OpeningId", ""), opening_type, x_in, y_in, w_in, h_in, clearances))
+        openings.append(Opening(row.opening_id, opening_type, row.x_in, row.y_in, row.w_in, row.h_in, clearances))
     
     return openings
 
@@ -356,26 +458,40 @@ def adjust_panels_for_small_openings(panels, openings, constraints, dim_inc):
     SMALL_W = 72.0 
     SMALL_H = 120.0
     spacing = constraints.panel_spacing
+    min_w = constraints.min_width
 
     for opening in openings:
-        if not (opening.w < SMALL_W and opening.h < SMALL_H): continue
-
-        opening_right = opening.x + opening.w
-        band_panels = [
-            p for p in panels
-            if not (p.y + p.h <= opening.y or p.y >= opening.y + opening.h)
-        ]
-        band_panels.sort(key=lambda p: p.x)
-
-        for i in range(len(band_panels) - 1):
-            left = band_panels[i]
-            right = band_panels[i + 1]
+        ox, oy, ow, oh = opening.x, opening.y, opening.w, opening.h
+        if not (ow < SMALL_W and oh < SMALL_H): continue
+
+        opening_right = ox + ow
+        opening_top = oy + oh
+
+        # Single pass: collect the band, and the panels whose seam lands inside
+        # the opening. Only those need their right-hand neighbour, so the band
+        # is never sorted. Keys are (x, band index) to match a stable x-sort.
+        band_panels = []
+        seam_panels = []
+        for p in panels:
+            if p.y + p.h <= oy or p.y >= opening_top: continue
+            key = (p.x, len(band_panels))
+            band_panels.append((key, p))
+            if ox < p.x + p.w + spacing < opening_right:
+                seam_panels.append((key, p))
+        if not seam_panels: continue
+        seam_panels.sort()
+
+        for left_key, left in seam_panels:
+            right_key = right = None
+            for key, p in band_panels:
+                if key > left_key and (right_key is None or key < right_key):
+                    right_key, right = key, p
+            if right is None: continue
             actual_seam = left.x + left.w + spacing
 
             if abs(right.x - actual_seam) > 1.0: continue
-            if not (opening.x < actual_seam < opening_right): continue
 
-            new_seam = snap_down(opening.x, dim_inc)
+            new_seam = snap_down(ox, dim_inc)
             if new_seam <= left.x: continue
 
             delta = actual_seam - new_seam
@@ -383,7 +499,7 @@ def adjust_panels_for_small_openings(panels, openings, constraints, dim_inc):
             new_right_x = new_seam
             new_right_fab_w = (right.x + right.w) - new_right_x
 
-            if new_left_fab_w < constraints.min_width or new_right_fab_w < constraints.min_width:
+            if new_left_fab_w < min_w or new_right_fab_w < min_w:
                 continue
 
             left.w = float(new_left_fab_w)
@@ -401,8 +517,12 @@ def panels_overlap(p1, p2):
                 p1.y + p1.h <= p2.y or p2.y + p2.h <= p1.y)
 
 def is_storefront_like(opening):
-    otype = (opening.type or "").lower()
-    return ("storefront" in otype) or ("curtain" in otype)
+    return opening.storefront_like
+
+# Per-opening log templates, %-formatted at the call site
+_MSG_OVERLAP_WARN = "    [WARN] Panel overlaps hard clearance"
+_MSG_SF_BLOCKER = "    [BLOCKER] Storefront %s forced to block. Gap set to %s."
+_MSG_WIDE_BLOCKER = "    [BLOCKER] Opening %s (Width=%.1f\") > Max Panel. Gap set to %s."
 
 def classify_openings_dynamic(openings, constraints):
     """
@@ -413,61 +533,114 @@ def classify_openings_dynamic(openings, constraints):
     spacing = constraints.panel_spacing
 
     for op in openings:
-        otype = op.type.lower()
-        is_storefront = "storefront" in otype or "curtain" in otype
-        
+        oc = op.original_clearances
+        cl = op.clearances
+
         # [FIX] If it's a Storefront, it is ALWAYS a blocker.
-        if is_storefront:
-            op.force_blocker = True
-            op.clearances.jamb_min = spacing
-            op.clearances.header_min = spacing
-            op.clearances.sill_min = spacing
-            print("    [BLOCKER] Storefront {} forced to block. Gap set to {}.".format(op.id, spacing))
-            continue
+        if is_storefront_like(op):
+            print(_MSG_SF_BLOCKER % (op.id, spacing))
+            blocker = True
+        # For normal windows/doors, check size: fits -> Cutout, too wide -> Blocker
+        elif op.w + oc.jamb_min * 2 <= max_panel_w:
+            blocker = False
+        else:
+            print(_MSG_WIDE_BLOCKER % (op.id, op.w, spacing))
+            blocker = True
 
-        # For normal windows/doors, check size
-        required_span = op.w + op.original_clearances.jamb_min * 2
-        
-        if required_span <= max_panel_w:
-            # Fits -> Cutout
-            op.force_blocker = False
-            op.clearances.jamb_min = op.original_clearances.jamb_min
-            op.clearances.header_min = op.original_clearances.header_min
-            op.clearances.sill_min = op.original_clearances.sill_min
+        op.force_blocker = blocker
+        if blocker:
+            cl.jamb_min = cl.header_min = cl.sill_min = spacing
         else:
-            # Too wide -> Blocker
-            op.force_blocker = True
-            op.clearances.jamb_min = spacing
-            op.clearances.header_min = spacing
-            op.clearances.sill_min = spacing
-            print("    [BLOCKER] Opening {} (Width={:.1f}\") > Max Panel. Gap set to {}.".format(op.id, op.w, spacing))
+            cl.jamb_min, cl.header_min, cl.sill_min = oc.jamb_min, oc.header_min, oc.sill_min
 
+# Public predicates. Placement loops read opening.force_blocker directly: it is
+# set once per run by classify_openings_dynamic.
 def is_blocking_storefront(opening, constraints):
     return opening.force_blocker
 
 def is_cutout_opening(opening, constraints):
     return not opening.force_blocker
 
+def clearance_zone_box(opening):
+    """(left, right, bottom, top, opening) with the zone properties read once."""
+    return (opening.left_clearance_zone, opening.right_clearance_zone,
+            opening.bottom_clearance_zone, opening.top_clearance_zone, opening)
+
+class OpeningIndex(object):
+    """
+    Uniform x-grid over opening clearance zones, built once per opening list
+    (after classification, since that resizes the zones). near() returns the
+    openings whose zone may overlap [x0, x1], in their original list order;
+    boxes_near() returns the same hits as precomputed clearance_zone_box tuples.
+    Short lists are returned whole: a plain scan is cheaper than bucketing.
+    """
+    CELLS = 32
+    MIN_INDEXED = 8
+
+    def __init__(self, openings):
+        self.openings = list(openings)
+        self.boxes = [clearance_zone_box(o) for o in self.openings]
+        self.buckets = None
+        if len(self.openings) < self.MIN_INDEXED: return
+
+        self.x0 = min(b[0] for b in self.boxes)
+        span = max(b[1] for b in self.boxes) - self.x0
+        self.cell_w = max(span / float(self.CELLS), 1.0)
+        self.buckets = {}
+        for i, box in enumerate(self.boxes):
+            for c in range(self._cell(box[0]), self._cell(box[1]) + 1):
+                self.buckets.setdefault(c, []).append(i)
+
+    def _cell(self, x):
+        return int(math.floor((x - self.x0) / self.cell_w))
+
+    def _hits(self, x0, x1):
+        hits = set()
+        for c in range(self._cell(x0), self._cell(x1) + 1):
+            hits.update(self.buckets.get(c, ()))
+        return sorted(hits)
+
+    def near(self, x0, x1):
+        if self.buckets is None: return self.openings
+        return [self.openings[i] for i in self._hits(x0, x1)]
+
+    def boxes_near(self, x0, x1):
+        if self.buckets is None: return self.boxes
+        return [self.boxes[i] for i in self._hits(x0, x1)]
+
+
+def _openings_near(openings, x0, x1):
+    """Candidate openings for [x0, x1] from a plain list or an OpeningIndex."""
+    if isinstance(openings, OpeningIndex): return openings.near(x0, x1)
+    return openings
+
+def _boxes_near(openings, x0, x1):
+    """Like _openings_near, as clearance_zone_box tuples."""
+    if isinstance(openings, OpeningIndex): return openings.boxes_near(x0, x1)
+    return [clearance_zone_box(o) for o in openings]
+
+
 def panel_overlaps_clearance(panel, openings, constraints, allow_intentional=False):
-    p_right = panel.x + panel.w
-    p_top = panel.y + panel.h
+    if allow_intentional: return False
+    p_left, p_bottom = panel.x, panel.y
+    p_right = p_left + panel.w
+    p_top = p_bottom + panel.h
 
-    for opening in openings:
-        if allow_intentional: continue
-        if is_cutout_opening(opening, constraints): continue
+    for left, right, bottom, top, opening in _boxes_near(openings, p_left, p_right):
+        if not opening.force_blocker: continue
 
         if not (
-            p_right <= opening.left_clearance_zone or
-            panel.x >= opening.right_clearance_zone or
-            p_top <= opening.bottom_clearance_zone or
-            panel.y >= opening.top_clearance_zone
+            p_right <= left or
+            p_left >= right or
+            p_top <= bottom or
+            p_bottom >= top
         ):
             return True
     return False
 
 
 def fill_vertical_gap(region_x_start, region_x_end, gap_y_start, gap_y_end,
-                      opening_left, opening_right, panels, panel_counter,
+                      opening_left, opening_right, panels,
                       constraints, all_openings, label,
                       is_storefront=False):
     PANEL_WIDTH_MIN = constraints.min_width
@@ -487,18 +660,42 @@ def fill_vertical_gap(region_x_start, region_x_end, gap_y_start, gap_y_end,
     gap_width  = panel_x_end - panel_x_start
     gap_height = gap_y_end - gap_y_start
 
-    if gap_width < PANEL_WIDTH_MIN or gap_height < PANEL_HEIGHT_MIN:
-        return panel_counter
+    # A zero increment snaps every height to 0 (snap_down's error path), so
+    # nothing could be placed; returning here also keeps the inlined snaps
+    # below, (v // inc) * inc, clear of a zero division.
+    inc = DIMENSION_INCREMENT
+    if gap_width < PANEL_WIDTH_MIN or gap_height < PANEL_HEIGHT_MIN or not inc:
+        return
 
+    # Every candidate lies inside the gap box, so only panels touching it (plus
+    # a 1" pad against float round-off at the edges) can block one. Panels from
+    # this fill are appended to the list as they are placed.
+    box_left, box_right = panel_x_start - 1.0, panel_x_end + 1.0
+    box_bottom, box_top = gap_y_start - 1.0, gap_y_end + 1.0
+    nearby = sorted((
+        p for p in panels
+        if not (box_right <= p.x or p.x + p.w <= box_left or
+                box_top <= p.y or p.y + p.h <= box_bottom)
+    ), key=lambda p: p.x)
+    # Kept sorted by x, so a candidate only scans panels starting within
+    # [left - widest - 1", right); the 1" pad absorbs float round-off.
+    nearby_x = [p.x for p in nearby]
+    widest = max([p.w for p in nearby] or [0.0])
+
+    # Row layout depends only on the gap height: (y, height, max width) per row.
+    rows = []
     y_cursor = gap_y_start
     while y_cursor < gap_y_end:
         remaining_height = gap_y_end - y_cursor
         if remaining_height < PANEL_HEIGHT_MIN: break
 
-        panel_h = snap_down(remaining_height, DIMENSION_INCREMENT)
+        panel_h = (remaining_height // inc) * inc
         if panel_h < PANEL_HEIGHT_MIN: break
 
-        max_width = SHORT_MAX if panel_h > SHORT_MAX else LONG_MAX
+        rows.append((y_cursor, panel_h, SHORT_MAX if panel_h > SHORT_MAX else LONG_MAX))
+        y_cursor += (panel_h + spacing)
+
+    for y_cursor, panel_h, max_width in rows:
         x_cursor = panel_x_start
         row_placed = False
 
@@ -507,31 +704,40 @@ def fill_vertical_gap(region_x_start, region_x_end, gap_y_start, gap_y_end,
             if remaining_width < PANEL_WIDTH_MIN: break
 
             panel_w = min(remaining_width, max_width)
-            panel_w = snap_down(panel_w, DIMENSION_INCREMENT)
+            panel_w = (panel_w // inc) * inc
 
             leftover = remaining_width - panel_w
             if leftover > 0 and leftover < (PANEL_WIDTH_MIN + spacing):
-                panel_w = snap_down(remaining_width, DIMENSION_INCREMENT)
+                panel_w = (remaining_width // inc) * inc
 
             if panel_w < PANEL_WIDTH_MIN or not is_valid_panel(panel_w, panel_h, constraints): break
 
-            candidate = Panel(x_cursor, y_cursor, panel_w, panel_h, "P{:02d}".format(panel_counter))
-
-            if any(panels_overlap(candidate, p) for p in panels): break
-            if panel_overlaps_clearance(candidate, all_openings, constraints, allow_intentional=True): break
+            # Overlap test on plain floats; the Panel is only built once it fits.
+            # (Gap fills may run through cutout clearances, so there is no
+            # clearance check here: allow_intentional=True always passed.)
+            c_left, c_bottom = float(x_cursor), float(y_cursor)
+            c_right, c_top = c_left + panel_w, c_bottom + panel_h
+            blocked = False
+            lo = bisect.bisect_left(nearby_x, c_left - widest - 1.0)
+            hi = bisect.bisect_left(nearby_x, c_right)
+            for p in nearby[lo:hi]:
+                if not (p.x + p.w <= c_left or
+                        c_top <= p.y or p.y + p.h <= c_bottom):
+                    blocked = True
+                    break
+            if blocked: break
 
+            candidate = Panel(x_cursor, y_cursor, panel_w, panel_h)
             candidate.cutouts = calculate_panel_cutouts(candidate, all_openings)
             panels.append(candidate)
-            panel_counter += 1
+            i = bisect.bisect_right(nearby_x, candidate.x)
+            nearby_x.insert(i, candidate.x)
+            nearby.insert(i, candidate)
+            widest = max(widest, candidate.w)
             row_placed = True
             x_cursor += (panel_w + spacing)
 
-        if row_placed:
-            y_cursor += (panel_h + spacing)
-        else:
-            break
-
-    return panel_counter
+        if not row_placed: break
 
 
 def calculate_segment_layout(start_x, target_x, max_w, min_w, inc, spacing):
@@ -539,23 +745,52 @@ def calculate_segment_layout(start_x, target_x, max_w, min_w, inc, spacing):
     if total_dist < min_w: return total_dist
     if total_dist <= max_w: return snap_down(total_dist, inc)
 
-    n_panels = 1
-    while True:
-        total_spacing = (n_panels - 1) * spacing
-        available_width = total_dist - total_spacing
-        candidate_width = available_width / n_panels
-
-        if candidate_width <= max_w:
-            if candidate_width < min_w: return max_w
-            return snap_down(candidate_width, inc)
+    # Fewest equal panels that fit: n >= (dist + spacing) / (max_w + spacing).
+    # The closed form only seeds n; the steps below settle on the smallest n
+    # that passes the width test itself (float round-off), capped at 100.
+    step = max_w + spacing
+    n_panels = max(1, int(math.ceil((total_dist + spacing) / step))) if step > 0 else 1
+    n_panels = min(n_panels, 101)
+    while n_panels > 1 and (total_dist - (n_panels - 2) * spacing) / (n_panels - 1) <= max_w:
+        n_panels -= 1
+    while n_panels <= 100 and (total_dist - (n_panels - 1) * spacing) / n_panels > max_w:
         n_panels += 1
-        if n_panels > 100: return max_w
+    if n_panels > 100: return max_w
+
+    candidate_width = (total_dist - (n_panels - 1) * spacing) / n_panels
+    if candidate_width < min_w: return max_w
+    return snap_down(candidate_width, inc)
 
 
+_BAND_CACHE = {}
+
+def horizontal_bands(wall_height, short_max, dim_inc, min_height):
+    """Stacked (y_start, y_end) bands for horizontal mode, cached per wall height."""
+    key = (wall_height, short_max, dim_inc, min_height)
+    bands = _BAND_CACHE.get(key)
+    if bands is None:
+        bands = []
+        cy = 0
+        while cy < wall_height:
+            rem_h = wall_height - cy
+            bh = snap_down(min(rem_h, short_max), dim_inc)
+            if bh >= min_height:
+                bands.append((cy, cy + bh))
+                cy += bh
+            else: break
+        bands = _BAND_CACHE[key] = tuple(bands)
+    return bands
+
+
+# Overlap warnings printed by place_panels_sequential; process_wall reads it
+# around a placement so cached layouts can repeat the warnings on a hit.
+_OVERLAP_WARNINGS = 0
+
 def place_panels_sequential(wall_width, wall_height, openings, constraints, orientation="vertical"):
     """
     Fixed panel placement with Lookahead Logic + Seam Validation.
     """
+    global _OVERLAP_WARNINGS
     orientation = str(orientation or "vertical").lower()
     horizontal_mode = (orientation == "horizontal")
 
@@ -571,11 +806,11 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
     spacing = float(getattr(constraints, "panel_spacing", 0.0) or 0.0)
 
     panels = []
-    panel_counter = 1
 
     sorted_openings = sorted(openings, key=lambda o: o.x)
-    blocking_storefronts = [o for o in sorted_openings if is_blocking_storefront(o, constraints)]
-    regular_openings = [o for o in sorted_openings if o not in blocking_storefronts]
+    blocking_storefronts = [o for o in sorted_openings if o.force_blocker]
+    regular_openings = [o for o in sorted_openings if not o.force_blocker]
+    all_openings_index = OpeningIndex(sorted_openings)
 
     # BUILD X-REGIONS
     regions = []
@@ -587,24 +822,35 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
         })
     else:
         storefronts_sorted = sorted(blocking_storefronts, key=lambda sf: sf.left_clearance_zone)
-        x_boundaries = [0]
+        x_boundaries = set([0, wall_width])
+        for sf in storefronts_sorted:
+            x_boundaries.add(sf.left_clearance_zone)
+            x_boundaries.add(sf.right_clearance_zone)
+        # Exact dedup; slivers from near-equal edges are dropped below by the
+        # PANEL_WIDTH_MIN check, so no rounding is applied here.
+        x_boundaries = sorted(x_boundaries)
+
+        # Storefront zones merged into disjoint spans: a region is blocked iff
+        # the last span starting left of x_end reaches past x_start.
+        span_lefts, span_rights = [], []
         for sf in storefronts_sorted:
-            x_boundaries.extend([sf.left_clearance_zone, sf.right_clearance_zone])
-        x_boundaries.append(wall_width)
-        x_boundaries = sorted(list(set(x_boundaries)))
+            left, right = sf.left_clearance_zone, sf.right_clearance_zone
+            if span_rights and left <= span_rights[-1]:
+                span_rights[-1] = max(span_rights[-1], right)
+            else:
+                span_lefts.append(left)
+                span_rights.append(right)
 
         for i in range(len(x_boundaries) - 1):
             x_start, x_end = x_boundaries[i], x_boundaries[i + 1]
             if (x_end - x_start) < PANEL_WIDTH_MIN: continue
 
-            blocked = any(
-                not (x_end <= sf.left_clearance_zone or x_start >= sf.right_clearance_zone)
-                for sf in storefronts_sorted
-            )
+            j = bisect.bisect_left(span_lefts, x_end) - 1
+            blocked = j >= 0 and span_rights[j] > x_start
             if not blocked:
                 region_openings_list = [
-                    o for o in regular_openings
-                    if not (o.right_clearance_zone <= x_start or o.left_clearance_zone >= x_end)
+                    o for left, right, _, _, o in all_openings_index.boxes_near(x_start, x_end)
+                    if not o.force_blocker and not (right <= x_start or left >= x_end)
                 ]
                 regions.append({
                     'x_start': x_start, 'x_end': x_end,
@@ -615,16 +861,12 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
     # PROCESS EACH REGION
     for region in regions:
         region_openings = region['openings']
-        bands = []
+        # Regions run left to right and every panel starts inside its own
+        # region, so only panels appended from here on can belong to this one.
+        region_first_panel = len(panels)
+        region_index = OpeningIndex(region_openings)
         if horizontal_mode:
-            cy = 0
-            while cy < wall_height:
-                rem_h = wall_height - cy
-                bh = snap_down(min(rem_h, SHORT_MAX), DIMENSION_INCREMENT)
-                if bh >= PANEL_HEIGHT_MIN:
-                    bands.append((cy, cy + bh))
-                    cy += bh
-                else: break
+            bands = horizontal_bands(wall_height, SHORT_MAX, DIMENSION_INCREMENT, PANEL_HEIGHT_MIN)
         else:
             bands = [(region['y_start'], region['y_end'])]
 
@@ -633,17 +875,23 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
             max_width_for_band = SHORT_MAX if band_height > SHORT_MAX else LONG_MAX
             x_cursor = max(0.0, region['x_start'])
 
+            # Blockers crossing this band, leftmost clearance first (stable, so
+            # ties keep list order like min() did).
+            band_blockers = sorted(
+                (b for b in region_index.boxes
+                 if b[4].force_blocker and not (b[3] <= y_start or b[2] >= y_end)),
+                key=lambda b: b[0]
+            )
+
             while x_cursor < region['x_end']:
                 remaining_wall = region['x_end'] - x_cursor
                 if remaining_wall < PANEL_WIDTH_MIN: break
 
-                future_openings = [
-                    o for o in region_openings
-                    if (o.left_clearance_zone > x_cursor + 0.01)
-                    and not (o.top_clearance_zone <= y_start or o.bottom_clearance_zone >= y_end)
-                    and not is_cutout_opening(o, constraints)
-                ]
-                next_opening = min(future_openings, key=lambda o: o.left_clearance_zone) if future_openings else None
+                next_opening = None
+                for b in band_blockers:
+                    if b[0] > x_cursor + 0.01:
+                        next_opening = b[4]
+                        break
 
                 hard_stop_x = region['x_end']
                 target_is_opening = False
@@ -654,10 +902,9 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
 
                     if can_bridge:
                         panel_w = snap_down(bridge_dist, DIMENSION_INCREMENT)
-                        candidate = Panel(x_cursor, y_start, panel_w, band_height, "P{:02d}".format(panel_counter))
-                        candidate.cutouts = calculate_panel_cutouts(candidate, region_openings)
+                        candidate = Panel(x_cursor, y_start, panel_w, band_height)
+                        candidate.cutouts = calculate_panel_cutouts(candidate, region_index)
                         panels.append(candidate)
-                        panel_counter += 1
                         x_cursor += (panel_w + spacing)
                         continue
                     else:
@@ -672,13 +919,13 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
 
                 panel_w = calculate_segment_layout(x_cursor, hard_stop_x, max_width_for_band, PANEL_WIDTH_MIN, DIMENSION_INCREMENT, spacing)
                 candidate_right = x_cursor + panel_w
-                for op in region_openings:
-                    if (op.left_clearance_zone + 0.1) < candidate_right < (op.right_clearance_zone - 0.1):
-                        dist_to_left_jamb = op.left_clearance_zone - x_cursor
+                for op_left, op_right, _, _, op in region_index.boxes:
+                    if (op_left + 0.1) < candidate_right < (op_right - 0.1):
+                        dist_to_left_jamb = op_left - x_cursor
                         if dist_to_left_jamb >= PANEL_WIDTH_MIN:
                             panel_w = snap_down(dist_to_left_jamb, DIMENSION_INCREMENT)
                         else:
-                            dist_to_right_jamb = op.right_clearance_zone - x_cursor
+                            dist_to_right_jamb = op_right - x_cursor
                             width_to_clear = snap_up(dist_to_right_jamb, DIMENSION_INCREMENT)
                             if width_to_clear <= max_width_for_band: panel_w = width_to_clear
                             else: panel_w = snap_down(max_width_for_band, DIMENSION_INCREMENT)
@@ -686,20 +933,20 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
 
                 if not is_valid_panel(panel_w, band_height, constraints): break
 
-                candidate = Panel(x_cursor, y_start, panel_w, band_height, "P{:02d}".format(panel_counter))
-                if panel_overlaps_clearance(candidate, region_openings, constraints, allow_intentional=False):
-                    print("    [WARN] Panel overlaps hard clearance")
+                candidate = Panel(x_cursor, y_start, panel_w, band_height)
+                overlaps_blocker, candidate.cutouts = evaluate_panel(candidate, region_index)
+                if overlaps_blocker:
+                    print(_MSG_OVERLAP_WARN)
+                    _OVERLAP_WARNINGS += 1
 
-                candidate.cutouts = calculate_panel_cutouts(candidate, region_openings)
                 panels.append(candidate)
-                panel_counter += 1
                 x_cursor += (panel_w + spacing)
 
                 if target_is_opening and abs(x_cursor - (hard_stop_x + spacing)) < 1.0:
                     x_cursor = next_opening.right_clearance_zone
 
         # FILL VERTICAL GAPS
-        gap_openings = [o for o in region_openings if not is_cutout_opening(o, constraints)]
+        gap_openings = [o for o in region_openings if o.force_blocker]
         for opening in gap_openings:
             if not is_storefront_like(opening) and opening.bottom_clearance_zone <= 0 and opening.top_clearance_zone >= wall_height:
                 continue
@@ -707,27 +954,27 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
             if opening.bottom_clearance_zone > 0:
                 gap_height = opening.bottom_clearance_zone - 0
                 if gap_height >= PANEL_HEIGHT_MIN:
-                    panel_counter = fill_vertical_gap(
+                    fill_vertical_gap(
                         region['x_start'], region['x_end'],
                         0, opening.bottom_clearance_zone,
                         opening.left_clearance_zone, opening.right_clearance_zone,
-                        panels, panel_counter, constraints, sorted_openings,
+                        panels, constraints, all_openings_index,
                         "below"
                     )
 
             if opening.top_clearance_zone < wall_height:
                 gap_height = wall_height - opening.top_clearance_zone
                 if gap_height >= PANEL_HEIGHT_MIN:
-                    panel_counter = fill_vertical_gap(
+                    fill_vertical_gap(
                         region['x_start'], region['x_end'],
                         opening.top_clearance_zone, wall_height,
                         opening.left_clearance_zone, opening.right_clearance_zone,
-                        panels, panel_counter, constraints, sorted_openings,
+                        panels, constraints, all_openings_index,
                         "above",
                         is_storefront_like(opening)
                     )
 
-        region_panels = [p for p in panels if (region['x_start'] <= p.x < region['x_end'])]
+        region_panels = [p for p in panels[region_first_panel:] if (region['x_start'] <= p.x < region['x_end'])]
         adjust_panels_for_small_openings(region_panels, region_openings, constraints, DIMENSION_INCREMENT)
 
     # EXTRA: Fill ABOVE AND BELOW BLOCKING storefront spans
@@ -738,11 +985,11 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
             gap_height = wall_height - sf.top_clearance_zone
             if gap_height >= PANEL_HEIGHT_MIN:
                 before_count = len(panels)
-                panel_counter = fill_vertical_gap(
+                fill_vertical_gap(
                     sf.left_clearance_zone, sf.right_clearance_zone,
                     sf.top_clearance_zone, wall_height,
                     sf.left_clearance_zone, sf.right_clearance_zone,
-                    panels, panel_counter, constraints, sorted_openings,
+                    panels, constraints, all_openings_index,
                     "above",
                     True
                 )
@@ -753,33 +1000,45 @@ def place_panels_sequential(wall_width, wall_height, openings, constraints, orie
             gap_height = sf.bottom_clearance_zone - 0
             if gap_height >= PANEL_HEIGHT_MIN:
                 before_count = len(panels)
-                panel_counter = fill_vertical_gap(
+                fill_vertical_gap(
                     sf.left_clearance_zone, sf.right_clearance_zone,
                     0, sf.bottom_clearance_zone,
                     sf.left_clearance_zone, sf.right_clearance_zone,
-                    panels, panel_counter, constraints, sorted_openings,
+                    panels, constraints, all_openings_index,
                     "below",
                     True
                 )
                 extra_filled += len(panels) - before_count
 
+    # Name panels in placement order once everything is placed.
+    for i, panel in enumerate(panels, 1):
+        panel.name = "P%02d" % i
+
     return panels
 
 
 def calculate_panel_cutouts(panel, openings):
+    return evaluate_panel(panel, openings)[1]
+
+def evaluate_panel(panel, openings):
+    """
+    Single pass over the openings near a panel. Returns (overlaps_blocker, cutouts):
+    whether it enters a blocker's clearance zone (panel_overlaps_clearance) and
+    its cutouts for the cutout openings (calculate_panel_cutouts).
+    """
+    overlaps_blocker = False
     cutouts = []
     p_left = panel.x
     p_right = panel.x + panel.w
     p_bottom = panel.y
     p_top = panel.y + panel.h
 
-    for opening in openings:
-        if opening.force_blocker: continue
-
-        hole_left = opening.left_clearance_zone
-        hole_right = opening.right_clearance_zone
-        hole_bottom = opening.bottom_clearance_zone
-        hole_top = opening.top_clearance_zone
+    for hole_left, hole_right, hole_bottom, hole_top, opening in _boxes_near(openings, p_left, p_right):
+        if opening.force_blocker:
+            if not (overlaps_blocker or p_right <= hole_left or p_left >= hole_right or
+                    p_top <= hole_bottom or p_bottom >= hole_top):
+                overlaps_blocker = True
+            continue
 
         inter_left = max(p_left, hole_left)
         inter_right = min(p_right, hole_right)
@@ -802,94 +1061,197 @@ def calculate_panel_cutouts(panel, openings):
             }
             cutouts.append(cutout_info)
 
-    return cutouts
+    return overlaps_blocker, cutouts
 
-def process_wall(wall_id, wall_width, wall_height, openings):
-    global ACTIVE_CONFIG
-    
-    if ACTIVE_CONFIG is None:
-        presets = get_preset_configs()
-        ACTIVE_CONFIG = presets.get("horizontal")
+# Layouts of walls already solved this session, keyed on everything
+# place_panels_sequential reads, with the number of overlap warnings it printed.
+# Repeated wall templates skip straight to records but log the same lines.
+_LAYOUT_CACHE = {}
+_LAYOUT_CACHE_MAX = 256
 
-    orientation = str(ACTIVE_CONFIG.optimization_strategy.panel_orientation or "vertical").lower()
-    
-    panels = place_panels_sequential(
-        wall_width, wall_height, openings,
-        ACTIVE_CONFIG.panel_constraints, orientation
+def _layout_key(wall_width, wall_height, openings, constraints, orientation):
+    """
+    Cache key plus {opening id: slot}. Openings are keyed by geometry, type and
+    original clearances (classification rewrites the live ones); ids enter only
+    as slots, so identical walls with different opening ids still share a layout.
+    """
+    slots = {}
+    ops = []
+    for i, o in enumerate(openings):
+        oc = o.original_clearances
+        ops.append((slots.setdefault(o.id, i), o.type, o.x, o.y, o.w, o.h,
+                    oc.jamb_min, oc.header_min, oc.sill_min))
+    key = (float(wall_width), float(wall_height), orientation,
+           tuple(sorted(vars(constraints).items())), tuple(ops))
+    return key, slots
+
+def _freeze_layout(panels, slots):
+    return tuple(
+        (p.x, p.y, p.w, p.h, p.name, tuple(
+            (slots[c["id"]], c["type"], c["x_in"], c["y_in"], c["width_in"], c["height_in"])
+            for c in p.cutouts))
+        for p in panels
     )
 
+def _thaw_layout(layout, openings):
+    panels = []
+    for x, y, w, h, name, cutouts in layout:
+        panel = Panel(x, y, w, h, name)
+        panel.cutouts = [{
+            "id": openings[slot].id,
+            "type": otype,
+            "x_in": cx,
+            "y_in": cy,
+            "width_in": cw,
+            "height_in": ch
+        } for slot, otype, cx, cy, cw, ch in cutouts]
+        panels.append(panel)
+    return panels
+
+PANEL_FIELDNAMES = [
+    "panel_name", "panel_type", "wall_id",
+    "x_in", "y_in", "width_in", "height_in",
+    "area_in2", "rotation_deg", "x_ref", "cutouts_json"
+]
+
+_MSG_WALL_RESULT = Ansi.GREEN + " Result: %d panels generated" + Ansi.RESET
+
+def process_wall(wall_id, wall_width, wall_height, openings, config=None):
+    global ACTIVE_CONFIG, _OVERLAP_WARNINGS
+    
+    if config is None:
+        if ACTIVE_CONFIG is None:
+            ACTIVE_CONFIG = get_preset_config("horizontal")
+        config = ACTIVE_CONFIG
+
+    orientation = str(config.optimization_strategy.panel_orientation or "vertical").lower()
+    constraints = config.panel_constraints
+
+    key, slots = _layout_key(wall_width, wall_height, openings, constraints, orientation)
+    cached = _LAYOUT_CACHE.get(key)
+    if cached is not None:
+        layout, overlap_warnings = cached
+        # Same log as a fresh placement: classification prints the [BLOCKER]
+        # lines with this wall's opening ids, then the stored [WARN]s follow
+        classify_openings_dynamic(openings, constraints)
+        for _ in range(overlap_warnings):
+            print(_MSG_OVERLAP_WARN)
+        panels = _thaw_layout(layout, openings)
+    else:
+        _OVERLAP_WARNINGS = 0
+        panels = place_panels_sequential(
+            wall_width, wall_height, openings,
+            constraints, orientation
+        )
+        if len(_LAYOUT_CACHE) >= _LAYOUT_CACHE_MAX: _LAYOUT_CACHE.clear()
+        _LAYOUT_CACHE[key] = (_freeze_layout(panels, slots), _OVERLAP_WARNINGS)
+
+    # One tuple per panel, in PANEL_FIELDNAMES order.
     records = []
     for panel in panels:
-        records.append({
-            "panel_name": panel.name,
-            "panel_type": "{}x{}".format(panel.w, panel.h),
-            "wall_id": wall_id,
-            "x_in": panel.x,
-            "y_in": panel.y,
-            "width_in": panel.w,
-            "height_in": panel.h,
-            "area_in2": panel.w * panel.h,
-            "rotation_deg": 0.0,
-            "x_ref": "start",
-            "cutouts_json": json.dumps(panel.cutouts) if panel.cutouts else ""
-        })
+        records.append((
+            panel.name,
+            "%sx%s" % (panel.w, panel.h),
+            wall_id,
+            panel.x,
+            panel.y,
+            panel.w,
+            panel.h,
+            panel.w * panel.h,
+            0.0,
+            "start",
+            json.dumps(panel.cutouts) if panel.cutouts else ""
+        ))
     
-    print(Ansi.GREEN + " Result: {} panels generated".format(len(panels)) + Ansi.RESET)
+    print(_MSG_WALL_RESULT % len(panels))
     return records
 
 
+# A wall optimizes in tens of microseconds, so a process pool (start-up plus
+# pickling every job and result) was several times slower than a plain loop
+# even at 1000 walls. CLI_WORKERS > 1 opts the CLI in; the pool is still
+# skipped below PARALLEL_MIN_WALLS.
+CLI_WORKERS = 1
+PARALLEL_MIN_WALLS = 5000
+
+def _process_wall_job(job):
+    """Pool entry point: job is a process_wall argument tuple."""
+    return process_wall(*job)
+
 def process_all_walls(walls_rows, openings_rows, output_dir,
                       door_clearances, window_clearances, storefront_clearances,
-                      config=None, orientation="vertical", output_filename="optimized_panel_placement.csv"):
+                      config=None, orientation="vertical", output_filename="optimized_panel_placement.csv",
+                      workers=1, panels_path=None, config_path=None, save_config=True):
+    """Optimize every wall and write the panel CSV plus config_used.json.
+    panels_path/config_path override the files derived from output_dir.
+    save_config=False leaves config_path as the caller already wrote it.
+    Returns (panels_path, config_path); each is None when nothing was written."""
     global ACTIVE_CONFIG
     if config is not None: ACTIVE_CONFIG = config
     elif ACTIVE_CONFIG is None:
-        presets = get_preset_configs()
-        ACTIVE_CONFIG = presets.get(orientation, presets["vertical"])
+        ACTIVE_CONFIG = get_preset_config(orientation if orientation in _PRESET_SPECS else "vertical")
     
-    all_panel_records = []
+    openings_by_wall = index_openings_by_wall(openings_rows)
+
+    jobs = []
     for wall_row in walls_rows:
-        wall_id = get_wall_id(wall_row)
-        dims = get_wall_dimensions(wall_row)
-        if dims is None: continue
+        wall_id = wall_row.wall_id
+        wall_width, wall_height = wall_row.length_in, wall_row.height_in
+        if wall_width <= 0 or wall_height <= 0: continue
         
-        wall_width, wall_height = dims
         openings = get_wall_openings(
-            wall_id, openings_rows,
+            wall_id, openings_by_wall,
             door_clearances, window_clearances, storefront_clearances
         )
-        panel_records = process_wall(wall_id, wall_width, wall_height, openings)
+        jobs.append((wall_id, wall_width, wall_height, openings, ACTIVE_CONFIG))
+
+    # Walls are independent; map() keeps results in input order.
+    results = None
+    if workers > 1 and ProcessPoolExecutor is not None and len(jobs) >= PARALLEL_MIN_WALLS:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as ex:
+                results = list(ex.map(_process_wall_job, jobs, chunksize=8))
+        except (OSError, RuntimeError) as e:
+            print(Ansi.YELLOW + "[WARN] Parallel run failed ({}). Running sequentially.".format(e) + Ansi.RESET)
+    if results is None:
+        results = [_process_wall_job(job) for job in jobs]
+
+    all_panel_records = []
+    for panel_records in results:
         all_panel_records.extend(panel_records)
     
     if not all_panel_records: return None, None
     
-    panels_csv = os.path.join(output_dir, output_filename)
-    fieldnames = [
-        "panel_name", "panel_type", "wall_id",
-        "x_in", "y_in", "width_in", "height_in",
-        "area_in2", "rotation_deg", "x_ref", "cutouts_json"
-    ]
-    panels_path = write_csv(panels_csv, all_panel_records, fieldnames)
+    panels_csv = panels_path or os.path.join(output_dir, output_filename)
+    panels_path = write_csv(panels_csv, all_panel_records, PANEL_FIELDNAMES)
     
+    config_out = config_path or os.path.join(output_dir, "config_used.json")
     config_path = None
-    if panels_path and ACTIVE_CONFIG:
-        config_path = os.path.join(output_dir, "config_used.json")
+    if panels_path and not save_config:
+        if os.path.exists(config_out): config_path = config_out
+    elif panels_path and ACTIVE_CONFIG:
         try:
             if not os.path.exists(output_dir): os.makedirs(output_dir)
-            ACTIVE_CONFIG.save(config_path)
+            ACTIVE_CONFIG.save(config_out)
+            config_path = config_out
         except: pass
     
     return panels_path, config_path
 
 def write_csv(path, rows, fieldnames=None):
+    """Rows are dicts, or tuples already in fieldnames order (written without per-row lookups).
+    Returns path once the file is written and closed; None if there were no rows."""
     if not rows: return None
     if fieldnames is None: fieldnames = list(rows[0].keys())
-    try: f = open(path, "w", newline="")
-    except TypeError: f = open(path, "w")
-    with f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in rows: writer.writerow(r)
+    with io.open(path, "w", newline="", encoding="utf-8") as f:
+        if isinstance(rows[0], dict):
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
     return path
 
 def is_valid_panel(w, h, constraints):
@@ -904,19 +1266,18 @@ def is_valid_panel(w, h, constraints):
 
 def find_next_opening_in_range(x_start, x_end, y_start, y_end, openings):
     """Find the leftmost opening that intersects with the given range."""
-    candidates = []
-    for o in openings:
+    best = None
+    for left, right, bottom, top, o in _boxes_near(openings, x_start, x_end):
         # Check if opening intersects horizontally
-        if o.right_clearance_zone <= x_start or o.left_clearance_zone >= x_end:
+        if right <= x_start or left >= x_end:
             continue
         # Check if opening intersects vertically
-        if o.top_clearance_zone <= y_start or o.bottom_clearance_zone >= y_end:
+        if top <= y_start or bottom >= y_end:
             continue
-        candidates.append(o)
-    
-    if not candidates:
-        return None
-    return min(candidates, key=lambda o: o.left_clearance_zone)
+        if best is None or left < best[0]:
+            best = (left, o)
+
+    return best[1] if best else None
 
 
 def determine_panel_width_with_opening(x_cursor, x_end, y_start, y_end, max_width, openings, constraints):
@@ -976,49 +1337,69 @@ def determine_panel_width_with_opening(x_cursor, x_end, y_start, y_end, max_widt
 # SECTION 6: VISUALIZATION (optional)
 # =============================================================================
 
-def visualize_wall_layout(wall_id, panels_csv, openings_csv, walls_csv, output_image=None):
+def load_visualization_tables(panels_csv, openings_csv, walls_csv):
+    """
+    Read the three CSVs once, grouped for per-wall lookups:
+    ({wall_id str: [(name, x, y, w, h)]}, {host wall id: [opening row]}, {wall id int: wall row}).
+    """
+    panels_by_wall = {}
+    for p in read_csv_rows(panels_csv):
+        panels_by_wall.setdefault(str(p.get("wall_id")), []).append((
+            p.get("panel_name", ""),
+            float(p.get("x_in", 0)), float(p.get("y_in", 0)),
+            float(p.get("width_in", 0)), float(p.get("height_in", 0))
+        ))
+
+    openings_by_wall = {}
+    for o in read_csv_rows(openings_csv):
+        openings_by_wall.setdefault(safe_float(o.get("HostWallId"), None), []).append(o)
+
+    # First row carrying the id in any id column wins, as in a top-down scan.
+    walls_by_id = {}
+    for r in read_csv_rows(walls_csv):
+        for col in ["WallId", "ElementId", "Id"]:
+            try:
+                if col in r: walls_by_id.setdefault(int(float(r.get(col))), r)
+            except Exception:
+                pass
+
+    return panels_by_wall, openings_by_wall, walls_by_id
+
+
+def visualize_wall_layout(wall_id, panels_csv, openings_csv, walls_csv, output_image=None, tables=None):
+    """tables: optional load_visualization_tables() result, to avoid re-reading the CSVs."""
     try:
         import plotly.graph_objects as go
     except Exception:
         print(Ansi.YELLOW + "[VIS] Plotly not installed, skipping" + Ansi.RESET)
         return
-    panels_rows = read_csv_rows(panels_csv)
-    openings_rows = read_csv_rows(openings_csv)
-    walls_rows = read_csv_rows(walls_csv)
+    if tables is None:
+        tables = load_visualization_tables(panels_csv, openings_csv, walls_csv)
+    panels_by_wall, openings_by_wall, walls_by_id = tables
     try:
         wall_id_int = int(float(wall_id))
     except Exception:
         wall_id_int = None
-    wall_row = None
-    for r in walls_rows:
-        for col in ["WallId", "ElementId", "Id"]:
-            try:
-                if col in r and int(float(r.get(col))) == wall_id_int:
-                    wall_row = r
-                    break
-            except Exception:
-                pass
-        if wall_row:
-            break
+    wall_row = walls_by_id.get(wall_id_int)
     if wall_row is None:
         print(Ansi.YELLOW + "[VIS] Wall {} not found".format(wall_id) + Ansi.RESET)
         return
     wall_width = safe_float(wall_row.get("Length(ft)", 0)) * 12.0
     wall_height = safe_float(wall_row.get("UnconnectedHeight(ft)", 0)) * 12.0
-    wall_panels = [p for p in panels_rows if str(p.get("wall_id")) == str(wall_id)]
-    wall_openings = [o for o in openings_rows if safe_float(o.get("HostWallId"), None) == wall_id_int]
-    fig = go.Figure()
-    fig.add_shape(type="rect", x0=0, y0=0, x1=wall_width, y1=wall_height,
-                  line=dict(color="black", width=3), fillcolor="lightgray", opacity=0.1)
+    wall_panels = panels_by_wall.get(str(wall_id), [])
+    wall_openings = openings_by_wall.get(wall_id_int, []) if wall_id_int is not None else []
+    # Shapes and annotations are collected and handed to plotly in one
+    # update_layout call; per-item add_shape/add_annotation re-validates the layout.
+    shapes = [dict(type="rect", x0=0, y0=0, x1=wall_width, y1=wall_height,
+                   line=dict(color="black", width=3), fillcolor="lightgray", opacity=0.1)]
+    annotations = []
     colors = ['rgba(65,105,225,0.3)', 'rgba(30,144,255,0.3)', 'rgba(100,149,237,0.3)']
-    for i, panel in enumerate(wall_panels):
-        x_in = float(panel.get("x_in", 0)); y_in = float(panel.get("y_in", 0))
-        w_in = float(panel.get("width_in", 0)); h_in = float(panel.get("height_in", 0))
-        fig.add_shape(type="rect", x0=x_in, y0=y_in, x1=x_in + w_in, y1=y_in + h_in,
-                      line=dict(color="blue", width=2), fillcolor=colors[i % len(colors)])
-        fig.add_annotation(x=x_in + w_in/2.0, y=y_in + h_in/2.0,
-                           text="<b>{}</b><br/>{}\"x{}\"".format(panel.get('panel_name', ''), w_in, h_in),
-                           showarrow=False, font=dict(size=10), bgcolor="white", opacity=0.8)
+    for i, (panel_name, x_in, y_in, w_in, h_in) in enumerate(wall_panels):
+        shapes.append(dict(type="rect", x0=x_in, y0=y_in, x1=x_in + w_in, y1=y_in + h_in,
+                           line=dict(color="blue", width=2), fillcolor=colors[i % len(colors)]))
+        annotations.append(dict(x=x_in + w_in/2.0, y=y_in + h_in/2.0,
+                                text="<b>{}</b><br/>{}\"x{}\"".format(panel_name, w_in, h_in),
+                                showarrow=False, font=dict(size=10), bgcolor="white", opacity=0.8))
     for opening in wall_openings:
         left_ft = safe_float(opening.get("LeftEdgeAlongWall(ft)", 0))
         width_ft = safe_float(opening.get("Width(ft)", 0))
@@ -1037,18 +1418,20 @@ def visualize_wall_layout(wall_id, panels_csv, openings_csv, walls_csv, output_i
             color = "darkgreen"; rgb = "0,100,0"; label = "Storefront"
         else:
             color = "purple"; rgb = "128,0,128"; label = "Window"
-        fig.add_shape(type="rect",
-                      x0=left_in - 6, y0=sill_in - 6,
-                      x1=left_in + width_in + 6, y1=sill_in + height_in + 8,
-                      line=dict(color="orange", width=1, dash="dash"), fillcolor="rgba(255,165,0,0.1)")
-        fig.add_shape(type="rect",
-                      x0=left_in, y0=sill_in,
-                      x1=left_in + width_in, y1=sill_in + height_in,
-                      line=dict(color=color, width=2), fillcolor="rgba({},{})".format(rgb, "0.4"))
-        fig.add_annotation(x=left_in + width_in/2.0, y=sill_in + height_in/2.0,
-                           text="{}<br/>{}\"x{}\"".format(label, float(width_in), float(height_in)),
-                           showarrow=False, font=dict(size=9, color="white"), bgcolor=color, opacity=0.9)
-    fig.update_layout(title="Wall {} - Sequential Panel Layout (Doors, Windows & Storefronts)".format(wall_id),
+        shapes.append(dict(type="rect",
+                           x0=left_in - 6, y0=sill_in - 6,
+                           x1=left_in + width_in + 6, y1=sill_in + height_in + 8,
+                           line=dict(color="orange", width=1, dash="dash"), fillcolor="rgba(255,165,0,0.1)"))
+        shapes.append(dict(type="rect",
+                           x0=left_in, y0=sill_in,
+                           x1=left_in + width_in, y1=sill_in + height_in,
+                           line=dict(color=color, width=2), fillcolor="rgba({},{})".format(rgb, "0.4")))
+        annotations.append(dict(x=left_in + width_in/2.0, y=sill_in + height_in/2.0,
+                                text="{}<br/>{}\"x{}\"".format(label, float(width_in), float(height_in)),
+                                showarrow=False, font=dict(size=9, color="white"), bgcolor=color, opacity=0.9))
+    fig = go.Figure()
+    fig.update_layout(shapes=shapes, annotations=annotations,
+                      title="Wall {} - Sequential Panel Layout (Doors, Windows & Storefronts)".format(wall_id),
                       xaxis=dict(range=[0, wall_width], title="Length (inches)", showgrid=True),
                       yaxis=dict(range=[0, wall_height], title="Height (inches)", showgrid=True, scaleanchor="x"),
                       width=1400, height=600, showlegend=False, plot_bgcolor='white')
@@ -1063,70 +1446,113 @@ def visualize_wall_layout(wall_id, panels_csv, openings_csv, walls_csv, output_i
 
 
 def visualize_all_walls(panels_csv, openings_csv, walls_csv, output_dir, save_as_image=True):
-    panels_rows = read_csv_rows(panels_csv)
-    wall_ids = sorted(set([r.get("wall_id") for r in panels_rows]))
+    tables = load_visualization_tables(panels_csv, openings_csv, walls_csv)
+    wall_ids = sorted(tables[0])
     print(Ansi.MAGENTA + "\n[VIS] Generating {} visualizations...".format(len(wall_ids)) + Ansi.RESET)
     for wid in wall_ids:
         output_image = os.path.join(output_dir, "wall_{}_layout.png".format(wid)) if save_as_image else None
-        visualize_wall_layout(wid, panels_csv, openings_csv, walls_csv, output_image)
+        visualize_wall_layout(wid, panels_csv, openings_csv, walls_csv, output_image, tables)
 
 
 # =============================================================================
 # SECTION 7A: INTERACTIVE CONFIG CREATOR (ORIENTATION-FOCUSED)
 # =============================================================================
-def create_simple_config():
-    """Interactive configuration creator with parameter preview/editing."""
-    # IronPython vs CPython input
+# IronPython vs CPython input, resolved once for every prompt below
+try:
+    get_input = raw_input  # type: ignore
+except NameError:
+    get_input = input
+
+
+# Per-wall log lines during a full run are written out in chunks of this size
+RUN_LOG_CHUNK = 64 * 1024
+
+
+class _StdoutBatch(object):
+    """Write sink that hands text to `out` in chunks of about `limit` chars
+    (everything at flush() when limit is None)."""
+    def __init__(self, out, limit=None):
+        self.out = out
+        self.limit = limit
+        self.parts = []
+        self.size = 0
+
+    def write(self, text):
+        self.parts.append(text)
+        self.size += len(text)
+        if self.limit and self.size >= self.limit:
+            self.flush()
+
+    def flush(self):
+        if self.parts:
+            self.out.write("".join(self.parts))
+            self.parts = []
+            self.size = 0
+        self.out.flush()
+
+
+@contextlib.contextmanager
+def batched_stdout(limit=None):
+    """Collect the prints inside the block and emit them in few writes: one at
+    the end, or one per `limit` chars for long runs that should show progress.
+    Never wrap a get_input() call: its prompt would be held back too.
+    Main thread only: this swaps the process-wide sys.stdout, and with a limit
+    the chunks are written from whichever thread printed. Code running on a
+    worker thread must not enter it; enter it on the calling thread instead,
+    with limit=None so everything is written there on exit."""
+    old = sys.stdout
+    batch = sys.stdout = _StdoutBatch(old, limit)
     try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
-
-    print("\n" + "=" * 60)
-    print("  PANEL OPTIMIZER CONFIGURATION")
-    print("=" * 60)
-
-    print("\nSelect configuration preset:")
-    print("1. Vertical Panels   (tall, narrow - best for high-rise)")
-    print("2. Horizontal Panels (wide, short - best for retail/commercial)")
-    print("3. Custom            (define all parameters)")
-
-    choice = get_input("\nChoice (1-3) [default: 1]: ").strip() or "1"
-
-    presets = get_preset_configs()
+        yield
+    finally:
+        sys.stdout = old
+        batch.flush()
 
-    if choice == "1":
-        config = presets["vertical"]
-        print("\n{}=== VERTICAL PANEL PRESET ==={}".format(Ansi.CYAN, Ansi.RESET))
-        print_config_summary(config)
-        pc = config.panel_constraints
-        print("  Spacing:      {}\"".format(pc.panel_spacing))
-
-
-        # Ask for confirmation first
-        confirm = get_input("\nUse these preset values? (y/n/edit) [y]: ").strip().lower()
-        if confirm == "n":
-            print("{}Cancelled. Returning to menu...{}".format(Ansi.YELLOW, Ansi.RESET))
-            return create_simple_config()  # Start over
-        elif confirm == "edit" or confirm == "e":
-            config = edit_panel_constraints(config)
+# Lowered y/n/edit answers; each prompt lowers its answer once and tests membership
+_YES = frozenset(("y", "yes"))
+_NO = frozenset(("n", "no"))
+_EDIT = frozenset(("e", "edit"))
 
-    elif choice == "2":
-        config = presets["horizontal"]
-        print("\n{}=== HORIZONTAL PANEL PRESET ==={}".format(Ansi.CYAN, Ansi.RESET))
-        print_config_summary(config)
+# create_simple_config menu choice -> preset name; anything else is Custom
+_PRESET_MENU = {"1": "vertical", "2": "horizontal"}
 
-        # Ask for confirmation first
-        confirm = get_input("\nUse these preset values? (y/n/edit) [y]: ").strip().lower()
-        if confirm == "n":
-            print("{}Cancelled. Returning to menu...{}".format(Ansi.YELLOW, Ansi.RESET))
-            return create_simple_config()  # Start over
-        elif confirm == "edit" or confirm == "e":
-            config = edit_panel_constraints(config)
 
-    else:  # choice == "3"
-        print("\n{}=== CUSTOM CONFIGURATION ==={}".format(Ansi.CYAN, Ansi.RESET))
-        config = create_custom_config()
+def create_simple_config():
+    """Interactive configuration creator with parameter preview/editing."""
+    while True:
+        sys.stdout.write("\n".join([
+            "\n" + "=" * 60,
+            "  PANEL OPTIMIZER CONFIGURATION",
+            "=" * 60,
+            "\nSelect configuration preset:",
+            "1. Vertical Panels   (tall, narrow - best for high-rise)",
+            "2. Horizontal Panels (wide, short - best for retail/commercial)",
+            "3. Custom            (define all parameters)",
+        ]) + "\n")
+
+        choice = get_input("\nChoice (1-3) [default: 1]: ").strip() or "1"
+
+        key = _PRESET_MENU.get(choice)
+        if key:
+            config = get_preset_config(key)
+            with batched_stdout():
+                print("\n{}=== {} PANEL PRESET ==={}".format(Ansi.CYAN, key.upper(), Ansi.RESET))
+                print_config_summary(config)
+                if key == "vertical":
+                    print("  Spacing:      {}\"".format(config.panel_constraints.panel_spacing))
+
+            # Ask for confirmation first
+            confirm = get_input("\nUse these preset values? (y/n/edit) [y]: ").strip().lower()
+            if confirm in _NO:
+                print(Ansi.YELLOW + "Cancelled. Returning to menu..." + Ansi.RESET)
+                continue  # Start over
+            elif confirm in _EDIT:
+                config = edit_panel_constraints(config)
+
+        else:  # choice == "3"
+            print("\n" + Ansi.CYAN + "=== CUSTOM CONFIGURATION ===" + Ansi.RESET)
+            config = create_custom_config()
+        break
 
     # Optional: project name override
     project_name = get_input("\nProject name [{}]: ".format(config.project_name)).strip()
@@ -1137,409 +1563,278 @@ def create_simple_config():
 
 
 def print_config_summary(config):
-    """Display configuration parameters."""
+    """Display configuration parameters (built up and written in one go)."""
     pc = config.panel_constraints
-    print("\nPanel Constraints:")
-    print("  Orientation:  {}".format(config.optimization_strategy.panel_orientation))
-    print("  Min Width:    {}\"".format(pc.min_width))
-    print("  Max Width:    {}\"".format(pc.max_width))
-    print("  Min Height:   {}\"".format(pc.min_height))
-    print("  Max Height:   {}\"".format(pc.max_height))
-    print("  Short Max:    {}\"".format(pc.short_max))
-    print("  Long Max:     {}\"".format(pc.long_max))
-    print("  Increment:    {}\"".format(pc.dimension_increment))
-
-    print("\nClearances:")
-    print("  Doors:       jamb={}\" header={}\" sill={}\"".format(
-        config.door_clearances.jamb_min,
-        config.door_clearances.header_min,
-        config.door_clearances.sill_min))
-    print("  Windows:     jamb={}\" header={}\" sill={}\"".format(
-        config.window_clearances.jamb_min,
-        config.window_clearances.header_min,
-        config.window_clearances.sill_min))
-    print("  Storefronts: jamb={}\" header={}\" sill={}\"".format(
-        config.storefront_clearances.jamb_min,
-        config.storefront_clearances.header_min,
-        config.storefront_clearances.sill_min))
+    lines = [
+        "\nPanel Constraints:",
+        "  Orientation:  {}".format(config.optimization_strategy.panel_orientation),
+        "  Min Width:    {}\"".format(pc.min_width),
+        "  Max Width:    {}\"".format(pc.max_width),
+        "  Min Height:   {}\"".format(pc.min_height),
+        "  Max Height:   {}\"".format(pc.max_height),
+        "  Short Max:    {}\"".format(pc.short_max),
+        "  Long Max:     {}\"".format(pc.long_max),
+        "  Increment:    {}\"".format(pc.dimension_increment),
+
+        "\nClearances:",
+        "  Doors:       jamb={}\" header={}\" sill={}\"".format(
+            config.door_clearances.jamb_min,
+            config.door_clearances.header_min,
+            config.door_clearances.sill_min),
+        "  Windows:     jamb={}\" header={}\" sill={}\"".format(
+            config.window_clearances.jamb_min,
+            config.window_clearances.header_min,
+            config.window_clearances.sill_min),
+        "  Storefronts: jamb={}\" header={}\" sill={}\"".format(
+            config.storefront_clearances.jamb_min,
+            config.storefront_clearances.header_min,
+            config.storefront_clearances.sill_min),
+    ]
+    sys.stdout.write("\n".join(lines) + "\n")
 
 def edit_panel_constraints(config):
     """Enhanced parameter editor with grouping, validation, and full customization."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
-
-    print("\n{}=== PARAMETER CUSTOMIZATION ==={}".format(Ansi.YELLOW, Ansi.RESET))
-    print("\nWhat would you like to edit?")
-    print("1. Panel Dimensions (width/height limits)")
-    print("2. Clearances (doors, windows, storefronts)")
-    print("3. Panel Orientation")
-    print("4. All Parameters")
-    print("5. Done (keep current values)")
+    sys.stdout.write("\n".join([
+        "\n" + Ansi.YELLOW + "=== PARAMETER CUSTOMIZATION ===" + Ansi.RESET,
+        "\nWhat would you like to edit?",
+        "1. Panel Dimensions (width/height limits)",
+        "2. Clearances (doors, windows, storefronts)",
+        "3. Panel Orientation",
+        "4. All Parameters",
+        "5. Done (keep current values)",
+    ]) + "\n")
 
     while True:
         choice = get_input("\nChoice (1-5) [5]: ").strip() or "5"
 
-        if choice == "1":
-            config = edit_panel_dimensions(config)
-        elif choice == "2":
-            config = edit_clearances(config)
-        elif choice == "3":
-            config = edit_orientation(config)
-        elif choice == "4":
-            config = edit_panel_dimensions(config)
-            config = edit_clearances(config)
-            config = edit_orientation(config)
+        if choice == "4":
+            for edit in _EDIT_SECTIONS:
+                config = edit(config)
             break
-        elif choice == "5":
+        if choice == "5":
             break
-        else:
-            print("{}Invalid choice. Please enter 1-5.{}".format(Ansi.RED, Ansi.RESET))
+        edit = _EDIT_DISPATCH.get(choice)
+        if edit is None:
+            print(Ansi.RED + "Invalid choice. Please enter 1-5." + Ansi.RESET)
             continue
+        config = edit(config)
 
         # After each edit, ask if they want to edit more
-        if choice in ["1", "2", "3"]:
-            more = get_input("\nEdit another section? (y/n) [n]: ").strip().lower()
-            if more != "y":
-                break
+        more = get_input("\nEdit another section? (y/n) [n]: ").strip().lower()
+        if more not in _YES:
+            break
 
-    print("\n{}Final Configuration:{}".format(Ansi.GREEN, Ansi.RESET))
-    print_config_summary(config)
+    with batched_stdout():
+        print("\n" + Ansi.GREEN + "Final Configuration:" + Ansi.RESET)
+        print_config_summary(config)
 
     confirm = get_input("\nUse this configuration? (y/n) [y]: ").strip().lower()
-    if confirm == "n":
-        print("{}Discarding changes...{}".format(Ansi.YELLOW, Ansi.RESET))
+    if confirm in _NO:
+        print(Ansi.YELLOW + "Discarding changes..." + Ansi.RESET)
         # Return original preset
-        presets = get_preset_configs()
         if "vertical" in config.project_name.lower():
-            return presets["vertical"]
+            return get_preset_config("vertical")
         else:
-            return presets["horizontal"]
+            return get_preset_config("horizontal")
 
     return config
 
 
-def edit_panel_dimensions(config):
-    """Edit panel dimension constraints with validation."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
+# Plain decimal with an optional trailing inch mark (e.g. 24, -0.5, .75, 30").
+_NUM_RE = re.compile(r'^([-+]?(?:\d+(?:\.\d*)?|\.\d+))\s*"?$')
 
-    print("\n{}--- PANEL DIMENSIONS ---{}".format(Ansi.CYAN, Ansi.RESET))
-    print("(Press Enter to keep current value)")
+# Colored message pieces reused on every re-prompt of _edit_float
+_INVALID_NUMBER = Ansi.RED + "Error: Invalid number" + Ansi.RESET
+_CHECK_PREFIX = {"Error": Ansi.RED + "Error: ", "Warning": Ansi.YELLOW + "Warning: "}
 
-    pc = config.panel_constraints
 
-    # Min Width
-    while True:
-        val = get_input("  Min Width [{}\"]: ".format(pc.min_width)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= 0:
-                print("    {}Error: Must be positive{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val >= pc.max_width:
-                print("    {}Error: Must be less than Max Width ({}\"){}".format(
-                    Ansi.RED, pc.max_width, Ansi.RESET))
-                continue
-            pc.min_width = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
-
-    # Max Width
-    while True:
-        val = get_input("  Max Width [{}\"]: ".format(pc.max_width)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= pc.min_width:
-                print("    {}Error: Must be greater than Min Width ({}\"){}".format(
-                    Ansi.RED, pc.min_width, Ansi.RESET))
-                continue
-            if new_val > pc.long_max:
-                print("    {}Warning: Exceeds Long Max ({}\")-consider adjusting Long Max too{}".format(
-                    Ansi.YELLOW, pc.long_max, Ansi.RESET))
-            pc.max_width = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
-
-    # Min Height
+def _edit_float(label, current, checks, indent="  "):
+    """
+    Prompt for one number until it is valid or Enter is pressed (returns None).
+    Each check(value) returns None or ("Error"|"Warning", text); the first
+    error rejects the value and re-prompts, warnings are shown and accepted.
+    """
+    pad = indent + "  "
     while True:
-        val = get_input("  Min Height [{}\"]: ".format(pc.min_height)).strip()
+        val = get_input("{}{} [{}\"]: ".format(indent, label, current)).strip()
         if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= 0:
-                print("    {}Error: Must be positive{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val >= pc.max_height:
-                print("    {}Error: Must be less than Max Height ({}\"){}".format(
-                    Ansi.RED, pc.max_height, Ansi.RESET))
-                continue
-            pc.min_height = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
+            return None
+        m = _NUM_RE.match(val)
+        if not m:
+            print(pad + _INVALID_NUMBER)
+            continue
+        new_val = float(m.group(1))
+        for check in checks:
+            result = check(new_val)
+            if result is None: continue
+            kind, text = result
+            print(pad + _CHECK_PREFIX[kind] + text + Ansi.RESET)
+            if kind == "Error": break
+        else:
+            return new_val
 
-    # Max Height
-    while True:
-        val = get_input("  Max Height [{}\"]: ".format(pc.max_height)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= pc.min_height:
-                print("    {}Error: Must be greater than Min Height ({}\"){}".format(
-                    Ansi.RED, pc.min_height, Ansi.RESET))
-                continue
-            if new_val > pc.long_max:
-                print("    {}Warning: Exceeds Long Max ({}\")-consider adjusting Long Max too{}".format(
-                    Ansi.YELLOW, pc.long_max, Ansi.RESET))
-            pc.max_height = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
 
-    # Short Max
-    while True:
-        val = get_input("  Short Max (one dimension must be <= this) [{}\"]: ".format(pc.short_max)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= 0:
-                print("    {}Error: Must be positive{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val > pc.long_max:
-                print("    {}Error: Must be <= Long Max ({}\"){}".format(
-                    Ansi.RED, pc.long_max, Ansi.RESET))
-                continue
-            pc.short_max = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
+def edit_panel_dimensions(config):
+    """Edit panel dimension constraints with validation."""
+    sys.stdout.write("\n{}--- PANEL DIMENSIONS ---{}\n(Press Enter to keep current value)\n".format(
+        Ansi.CYAN, Ansi.RESET))
 
-    # Long Max
-    while True:
-        val = get_input("  Long Max (absolute maximum for either dimension) [{}\"]: ".format(pc.long_max)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val < pc.short_max:
-                print("    {}Error: Must be >= Short Max ({}\"){}".format(
-                    Ansi.RED, pc.short_max, Ansi.RESET))
-                continue
-            pc.long_max = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
+    pc = config.panel_constraints
 
-    # Dimension Increment
-    while True:
-        val = get_input("  Dimension Increment (snap grid) [{}\"]: ".format(pc.dimension_increment)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val <= 0:
-                print("    {}Error: Must be positive{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val > 12:
-                print("    {}Warning: Large increment ({}\")-panels may not fit well{}".format(
-                    Ansi.YELLOW, new_val, Ansi.RESET))
-            pc.dimension_increment = new_val
-            break
-        except ValueError:
-            print("    {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
+    # Checks read pc when called, so each field sees the fields edited before it.
+    def positive(v):
+        if v <= 0: return ("Error", "Must be positive")
+    def over_long_max(v):
+        if v > pc.long_max:
+            return ("Warning", "Exceeds Long Max ({}\")-consider adjusting Long Max too".format(pc.long_max))
+    def bound(ok, attr, msg):
+        """Error unless ok(v, pc.<attr>); msg is formatted with that bound."""
+        def check(v):
+            limit = getattr(pc, attr)
+            if not ok(v, limit): return ("Error", msg.format(limit))
+        return check
+
+    fields = [
+        ("min_width", "Min Width", [
+            positive, bound(operator.lt, "max_width", "Must be less than Max Width ({}\")")]),
+        ("max_width", "Max Width", [
+            bound(operator.gt, "min_width", "Must be greater than Min Width ({}\")"), over_long_max]),
+        ("min_height", "Min Height", [
+            positive, bound(operator.lt, "max_height", "Must be less than Max Height ({}\")")]),
+        ("max_height", "Max Height", [
+            bound(operator.gt, "min_height", "Must be greater than Min Height ({}\")"), over_long_max]),
+        ("short_max", "Short Max (one dimension must be <= this)", [
+            positive, bound(operator.le, "long_max", "Must be <= Long Max ({}\")")]),
+        ("long_max", "Long Max (absolute maximum for either dimension)", [
+            bound(operator.ge, "short_max", "Must be >= Short Max ({}\")")]),
+        ("dimension_increment", "Dimension Increment (snap grid)", [
+            positive,
+            lambda v: ("Warning", "Large increment ({}\")-panels may not fit well".format(v)) if v > 12 else None]),
+    ]
+    for attr, label, checks in fields:
+        new_val = _edit_float(label, getattr(pc, attr), checks)
+        if new_val is not None:
+            setattr(pc, attr, new_val)
 
-    print("  {}✓ Panel dimensions updated{}".format(Ansi.GREEN, Ansi.RESET))
+    print("  " + Ansi.GREEN + "✓ Panel dimensions updated" + Ansi.RESET)
     return config
 
 
 def edit_clearances(config):
     """Edit clearance values for openings."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
-
-    print("\n{}--- CLEARANCES (inches) ---{}".format(Ansi.CYAN, Ansi.RESET))
-    print("(Press Enter to keep current value)")
+    sys.stdout.write("\n{}--- CLEARANCES (inches) ---{}\n(Press Enter to keep current value)\n".format(
+        Ansi.CYAN, Ansi.RESET))
 
     # Door Clearances
-    print("\n  {}DOOR CLEARANCES:{}".format(Ansi.BOLD, Ansi.RESET))
+    print("\n  " + Ansi.BOLD + "DOOR CLEARANCES:" + Ansi.RESET)
     config.door_clearances = edit_opening_clearance(
         "Door", config.door_clearances)
 
     # Window Clearances
-    print("\n  {}WINDOW CLEARANCES:{}".format(Ansi.BOLD, Ansi.RESET))
+    print("\n  " + Ansi.BOLD + "WINDOW CLEARANCES:" + Ansi.RESET)
     config.window_clearances = edit_opening_clearance(
         "Window", config.window_clearances)
 
     # Storefront Clearances
-    print("\n  {}STOREFRONT CLEARANCES:{}".format(Ansi.BOLD, Ansi.RESET))
+    print("\n  " + Ansi.BOLD + "STOREFRONT CLEARANCES:" + Ansi.RESET)
     config.storefront_clearances = edit_opening_clearance(
         "Storefront", config.storefront_clearances)
 
-    print("  {}✓ Clearances updated{}".format(Ansi.GREEN, Ansi.RESET))
+    print("  " + Ansi.GREEN + "✓ Clearances updated" + Ansi.RESET)
     return config
 
 
 def edit_opening_clearance(opening_type, clearances):
     """Edit clearances for a specific opening type."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
-
-    # Jamb
-    while True:
-        val = get_input("    Jamb (left/right) [{}\"]: ".format(clearances.jamb_min)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val < 0:
-                print("      {}Error: Cannot be negative{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val > 24:
-                print("      {}Warning: Large clearance ({}\")-may reduce coverage{}".format(
-                    Ansi.YELLOW, new_val, Ansi.RESET))
-            clearances.jamb_min = new_val
-            break
-        except ValueError:
-            print("      {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
-
-    # Header
-    while True:
-        val = get_input("    Header (top) [{}\"]: ".format(clearances.header_min)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val < 0:
-                print("      {}Error: Cannot be negative{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val > 24:
-                print("      {}Warning: Large clearance ({}\")-may reduce coverage{}".format(
-                    Ansi.YELLOW, new_val, Ansi.RESET))
-            clearances.header_min = new_val
-            break
-        except ValueError:
-            print("      {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
-
-    # Sill
-    while True:
-        val = get_input("    Sill (bottom) [{}\"]: ".format(clearances.sill_min)).strip()
-        if not val:
-            break
-        try:
-            new_val = float(val)
-            if new_val < 0:
-                print("      {}Error: Cannot be negative{}".format(Ansi.RED, Ansi.RESET))
-                continue
-            if new_val > 24:
-                print("      {}Warning: Large clearance ({}\")-may reduce coverage{}".format(
-                    Ansi.YELLOW, new_val, Ansi.RESET))
-            clearances.sill_min = new_val
-            break
-        except ValueError:
-            print("      {}Error: Invalid number{}".format(Ansi.RED, Ansi.RESET))
+    checks = [
+        lambda v: ("Error", "Cannot be negative") if v < 0 else None,
+        lambda v: ("Warning", "Large clearance ({}\")-may reduce coverage".format(v)) if v > 24 else None,
+    ]
+    for attr, label in [("jamb_min", "Jamb (left/right)"),
+                        ("header_min", "Header (top)"),
+                        ("sill_min", "Sill (bottom)")]:
+        new_val = _edit_float(label, getattr(clearances, attr), checks, indent="    ")
+        if new_val is not None:
+            setattr(clearances, attr, new_val)
 
     return clearances
 
 
 def edit_orientation(config):
     """Change panel orientation."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
-
-    print("\n{}--- PANEL ORIENTATION ---{}".format(Ansi.CYAN, Ansi.RESET))
     current = config.optimization_strategy.panel_orientation
-    print("  Current: {}".format(current))
-    print("\n  1. Vertical (tall panels)")
-    print("  2. Horizontal (wide panels)")
+    sys.stdout.write("\n".join([
+        "\n" + Ansi.CYAN + "--- PANEL ORIENTATION ---" + Ansi.RESET,
+        "  Current: {}".format(current),
+        "\n  1. Vertical (tall panels)",
+        "  2. Horizontal (wide panels)",
+    ]) + "\n")
 
     choice = get_input("\nChoice (1-2) or Enter to keep [{}]: ".format(current)).strip()
 
     if choice == "1":
         config.optimization_strategy.panel_orientation = "vertical"
         config.optimization_strategy.prefer_full_height_panels = True
-        print("  {}✓ Changed to VERTICAL{}".format(Ansi.GREEN, Ansi.RESET))
+        print("  " + Ansi.GREEN + "✓ Changed to VERTICAL" + Ansi.RESET)
     elif choice == "2":
         config.optimization_strategy.panel_orientation = "horizontal"
         config.optimization_strategy.prefer_full_height_panels = False
-        print("  {}✓ Changed to HORIZONTAL{}".format(Ansi.GREEN, Ansi.RESET))
+        print("  " + Ansi.GREEN + "✓ Changed to HORIZONTAL" + Ansi.RESET)
     else:
         print("  Keeping current orientation: {}".format(current))
 
     return config
 
+# edit_panel_constraints menu: "1"-"3" edit one section, "4" runs all in order
+_EDIT_SECTIONS = (edit_panel_dimensions, edit_clearances, edit_orientation)
+_EDIT_DISPATCH = dict(zip(("1", "2", "3"), _EDIT_SECTIONS))
+
 def create_custom_config():
     """Create fully custom configuration using the enhanced editing workflow."""
-    try:
-        get_input = raw_input  # type: ignore
-    except NameError:
-        get_input = input
+    with batched_stdout():
+        print("\n" + Ansi.CYAN + "=== CUSTOM CONFIGURATION ===" + Ansi.RESET)
+        print("Starting with default values. You'll customize each section.")
 
-    print("\n{}=== CUSTOM CONFIGURATION ==={}".format(Ansi.CYAN, Ansi.RESET))
-    print("Starting with default values. You'll customize each section.")
-
-    # Start with a default base config
-    presets = get_preset_configs()
-    config = presets["vertical"]  # Use vertical as starting point
-    config.project_name = "Custom Configuration"
-
-    # Orientation first
-    print("\n{}Step 1: Panel Orientation{}".format(Ansi.BOLD, Ansi.RESET))
-    print("  1. Vertical (tall panels)")
-    print("  2. Horizontal (wide panels)")
+        # Orientation first, so only the chosen preset is built
+        print("\n" + Ansi.BOLD + "Step 1: Panel Orientation" + Ansi.RESET)
+        print("  1. Vertical (tall panels)")
+        print("  2. Horizontal (wide panels)")
 
     orient_choice = get_input("\nChoice (1-2) [1]: ").strip() or "1"
-    if orient_choice == "2":
-        config = presets["horizontal"]
-        config.project_name = "Custom Configuration"
-        config.optimization_strategy.panel_orientation = "horizontal"
-        print("  {}✓ Starting with horizontal preset{}".format(Ansi.GREEN, Ansi.RESET))
-    else:
-        config.optimization_strategy.panel_orientation = "vertical"
-        print("  {}✓ Starting with vertical preset{}".format(Ansi.GREEN, Ansi.RESET))
+    key = "horizontal" if orient_choice == "2" else "vertical"
+    config = get_preset_config(key)
+    config.project_name = "Custom Configuration"
+    config.optimization_strategy.panel_orientation = key
+    with batched_stdout():
+        print("  {}✓ Starting with {} preset{}".format(Ansi.GREEN, key, Ansi.RESET))
 
-    # Show starting values
-    print("\n{}Starting Configuration:{}".format(Ansi.CYAN, Ansi.RESET))
-    print_config_summary(config)
+        # Show starting values
+        print("\n" + Ansi.CYAN + "Starting Configuration:" + Ansi.RESET)
+        print_config_summary(config)
 
-    # Panel Dimensions
-    print("\n{}Step 2: Panel Dimensions{}".format(Ansi.BOLD, Ansi.RESET))
+        # Panel Dimensions
+        print("\n" + Ansi.BOLD + "Step 2: Panel Dimensions" + Ansi.RESET)
     customize = get_input("Customize panel dimensions? (y/n) [y]: ").strip().lower()
-    if customize != "n":
+    if customize not in _NO:
         config = edit_panel_dimensions(config)
 
     # Clearances
-    print("\n{}Step 3: Clearances{}".format(Ansi.BOLD, Ansi.RESET))
+    print("\n" + Ansi.BOLD + "Step 3: Clearances" + Ansi.RESET)
     customize = get_input("Customize clearances? (y/n) [y]: ").strip().lower()
-    if customize != "n":
+    if customize not in _NO:
         config = edit_clearances(config)
 
     # Final review
-    print("\n{}=== FINAL CUSTOM CONFIGURATION ==={}".format(Ansi.GREEN, Ansi.RESET))
-    print_config_summary(config)
+    with batched_stdout():
+        print("\n" + Ansi.GREEN + "=== FINAL CUSTOM CONFIGURATION ===" + Ansi.RESET)
+        print_config_summary(config)
 
     confirm = get_input("\nUse this configuration? (y/n) [y]: ").strip().lower()
-    if confirm == "n":
-        print("{}Cancelled. Using default vertical preset.{}".format(Ansi.YELLOW, Ansi.RESET))
-        return presets["vertical"]
+    if confirm in _NO:
+        print(Ansi.YELLOW + "Cancelled. Using default vertical preset." + Ansi.RESET)
+        vertical = get_preset_config("vertical")
+        vertical.project_name = "Custom Configuration"
+        return vertical
 
     return config
 
@@ -1549,6 +1844,14 @@ def create_custom_config():
 # =============================================================================
 # SECTION 7: MAIN ENTRY POINT
 # =============================================================================
+def _same_file(a, b):
+    """True if both paths name the same file (symlinks, case-insensitive FS)."""
+    samefile = getattr(os.path, "samefile", None)  # missing on Windows in 2.7
+    if samefile is not None:
+        return samefile(a, b)
+    return os.path.normcase(os.path.realpath(a)) == os.path.normcase(os.path.realpath(b))
+
+
 def main():
     """
     OPTIONAL standalone CLI entry point for debugging only.
@@ -1560,10 +1863,7 @@ def main():
     print(Ansi.YELLOW + "[INFO] No input directory provided. "
                         "This CLI mode is only for manual debugging." + Ansi.RESET)
 
-    try:
-        input_dir = raw_input("Enter input folder path: ").strip()
-    except NameError:
-        input_dir = input("Enter input folder path: ").strip()
+    input_dir = get_input("Enter input folder path: ").strip()
 
     if not input_dir or not os.path.isdir(input_dir):
         print(Ansi.RED + "[ERROR] Invalid folder. Exiting." + Ansi.RESET)
@@ -1574,11 +1874,27 @@ def main():
     GENERATE_VISUALIZATIONS = True
     SAVE_VISUALIZATIONS_AS_PNG = True
 
+    # Resolve every input/output path once and check them in one pass
+    input_dir = os.path.abspath(input_dir)
+    paths = {
+        "config": os.path.join(input_dir, "optimizer_config.json"),
+        "used_config": os.path.join(input_dir, "config_used.json"),
+        "walls": os.path.join(input_dir, "walls.csv"),
+        "openings": os.path.join(input_dir, "wall_openings.csv"),
+    }
+    exists = {k: os.path.exists(v) for k, v in paths.items()}
+    config_file = paths["config"]
+    used_config_path = paths["used_config"]
+    walls_csv = paths["walls"]
+    openings_csv = paths["openings"]
+
     # Load or create config inside input_dir
-    config_file = os.path.join(input_dir, "optimizer_config.json")
-    if os.path.exists(config_file):
+    raw_config = None
+    if exists["config"]:
         print(Ansi.CYAN + "[CONFIG] Loading: {}".format(config_file) + Ansi.RESET)
-        config = OptimizerConfig.load(config_file)
+        with open(config_file, "rb") as f:
+            raw_config = f.read()
+        config = OptimizerConfig.from_dict(json.loads(raw_config.decode("utf-8")))
     else:
         print(Ansi.YELLOW + "[CONFIG] No configuration found. Creating new..." + Ansi.RESET)
         config = create_simple_config()
@@ -1586,39 +1902,44 @@ def main():
 
     ACTIVE_CONFIG = config
 
-    used_config_path = os.path.join(input_dir, "config_used.json")
-    config.save(used_config_path)
+    if raw_config is not None:
+        # Loaded config is unchanged: copy its bytes rather than re-encode it
+        with open(used_config_path, "wb") as f:
+            f.write(raw_config)
+    else:
+        config.save(used_config_path)
     print(" Saved run config to: {}".format(used_config_path))
 
-    walls_csv = os.path.join(input_dir, "walls.csv")
-    openings_csv = os.path.join(input_dir, "wall_openings.csv")
-
-    if not os.path.exists(walls_csv):
+    if not exists["walls"]:
         print(Ansi.RED + "[ERROR] walls.csv not found. Exiting." + Ansi.RESET)
         return
 
     openings_rows = []
-    if os.path.exists(openings_csv):
+    if exists["openings"]:
         openings_rows = load_openings_from_csv(openings_csv)
     else:
         print(Ansi.YELLOW + "[WARN] wall_openings.csv missing. Continuing without openings." + Ansi.RESET)
 
     walls_rows = load_walls_from_csv(walls_csv)
 
-    panels_path, config_path = process_all_walls(
-        walls_rows, openings_rows, input_dir,
-        config.door_clearances,
-        config.window_clearances,
-        config.storefront_clearances
-    )
+    with batched_stdout(RUN_LOG_CHUNK):
+        panels_path, config_path = process_all_walls(
+            walls_rows, openings_rows, input_dir,
+            config.door_clearances,
+            config.window_clearances,
+            config.storefront_clearances,
+            workers=CLI_WORKERS,
+            # Already written above (raw bytes when loaded); don't re-save over it
+            config_path=used_config_path, save_config=False
+        )
 
 
     # Copy config next to placement file
-    if panels_path:
-        dst = os.path.join(os.path.dirname(panels_path), "config_used.json")
-        if dst != used_config_path:
-            import shutil
-            shutil.copy(used_config_path, dst)
+    out_dir = os.path.dirname(panels_path) if panels_path else input_dir
+    if out_dir != input_dir:
+        dst = os.path.join(out_dir, "config_used.json")
+        if not (os.path.exists(dst) and _same_file(used_config_path, dst)):
+            shutil.copyfile(used_config_path, dst)
             print("Copied config to: {}".format(dst))
 
     if GENERATE_VISUALIZATIONS and panels_path:
@@ -6,7 +6,16 @@ considering openings from wall_openings.csv.
 
 from __future__ import print_function
 import os
-from datetime import datetime
+import re
+import errno
+import shutil
+import traceback
+
+# --- Import optimizer module sitting next to this script ---
+try:
+    import panel_calculator as opt
+except Exception as e:
+    raise Exception("Failed to import panel_calculator.py: {0}".format(e))
 
 # --- .NET UI imports ---
 import clr
@@ -15,25 +24,14 @@ clr.AddReference('System.Drawing')
 from System.Windows.Forms import (
     Application, FolderBrowserDialog, DialogResult, Form,
     Label, RadioButton, Button, FormBorderStyle, FormStartPosition,
-    MessageBox, MessageBoxButtons, MessageBoxIcon, TextBox, IWin32Window
+    MessageBox, MessageBoxButtons, MessageBoxIcon, TextBox, IWin32Window,
+    Control, ProgressBar, ProgressBarStyle, MethodInvoker
 )
 from System.Drawing import Point, Size
-
-# --- Additional refs to bind dialogs to Revit main window ---
-clr.AddReference('System')
-clr.AddReference('RevitAPI')
-clr.AddReference('RevitAPIUI')
-from System import IntPtr
-from Autodesk.Revit.UI import UIApplication
-
-# --- Import optimizer module sitting next to this script ---
-try:
-    import panel_calculator as opt
-except Exception as e:
-    raise Exception("Failed to import panel_calculator.py: {0}".format(e))
+from System import Array
 
 # =========================
-# Helpers: Revit window owner
+# UI: Dialog classes
 # =========================
 class WindowWrapper(IWin32Window):
     def __init__(self, handle):
@@ -42,71 +40,38 @@ class WindowWrapper(IWin32Window):
     def Handle(self):
         return self._hwnd
 
-def get_revit_owner():
-    """Return an IWin32Window wrapper of Revit's main window; None on failure."""
-    try:
-        # In pyRevit, __revit__ is already a UIApplication
-        uiapp = __revit__
-        hwnd = uiapp.MainWindowHandle
-        return WindowWrapper(IntPtr(hwnd))
-    except Exception as e:
-        print("Warning: could not retrieve Revit main window handle: {0}".format(e))
-        return None
-
-# =========================
-# UI: Folder Picker (click)
-# =========================
-
-def pick_data_folder():
-    """Show a FolderBrowserDialog; default to Desktop, fallback to Home; return selected path or script dir."""
-    owner = get_revit_owner()
-    dialog = FolderBrowserDialog()
-    dialog.Description = "Select folder containing walls.csv and wall_openings.csv"
-    # Default: Desktop; fallback: Home
-    initial_dir = os.path.join(os.path.expanduser("~"), "Desktop")
-    if not os.path.exists(initial_dir):
-        initial_dir = os.path.expanduser("~")
-    dialog.SelectedPath = initial_dir
-    result = dialog.ShowDialog(owner) if owner else dialog.ShowDialog()
-    if result == DialogResult.OK and dialog.SelectedPath and os.path.isdir(dialog.SelectedPath):
-        return dialog.SelectedPath
-    else:
-        # If user cancels, fall back to the folder where this script lives
-        return os.path.dirname(os.path.abspath(__file__))
-
-# =====================================
-# UI: Orientation Picker (radio buttons)
-# =====================================
+class RadioChoiceDialog(Form):
+    """Title, label, one radio button per option and OK/Cancel.
 
-class OrientationDialog(Form):
-    def __init__(self):
+    options is a list of (value, text, checked) tuples; show() returns the
+    value of the checked option, or None if canceled.
+    """
+    def __init__(self, title, label, options):
         # Basic form setup
-        self.Text = "Select Panel Orientation"
+        self.Text = title
         self.StartPosition = FormStartPosition.CenterScreen
         self.FormBorderStyle = FormBorderStyle.FixedDialog
         self.MaximizeBox = False
         self.MinimizeBox = False
         self.ClientSize = Size(600, 320)
         self.TopMost = True
+        self.SuspendLayout()
 
         # Label
         lbl = Label()
-        lbl.Text = "Select panel orientation:"
+        lbl.Text = label
         lbl.Location = Point(12, 12)
         lbl.AutoSize = True
-        self.Controls.Add(lbl)
-
-        # Radio buttons (default: Vertical)
-        self.rbVertical = RadioButton()
-        self.rbVertical.Text = "Vertical"
-        self.rbVertical.Checked = True
-        self.rbVertical.Location = Point(24, 40)
-        self.Controls.Add(self.rbVertical)
 
-        self.rbHorizontal = RadioButton()
-        self.rbHorizontal.Text = "Horizontal"
-        self.rbHorizontal.Location = Point(24, 66)
-        self.Controls.Add(self.rbHorizontal)
+        # Radio buttons, stacked 26px apart
+        self._choices = []
+        for i, (value, text, checked) in enumerate(options):
+            rb = RadioButton()
+            rb.Text = text
+            rb.Checked = checked
+            rb.Location = Point(24, 40 + 26 * i)
+            rb.AutoSize = True
+            self._choices.append((value, rb))
 
         # OK / Cancel buttons
         btnOK = Button()
@@ -121,93 +86,22 @@ class OrientationDialog(Form):
 
         self.AcceptButton = btnOK
         self.CancelButton = btnCancel
-        self.Controls.Add(btnOK)
-        self.Controls.Add(btnCancel)
-
+        _add_controls(self, [lbl] + [rb for _, rb in self._choices] + [btnOK, btnCancel])
 
-def pick_orientation():
-    """Show OrientationDialog and return 'vertical' or 'horizontal'; None if canceled."""
-    owner = get_revit_owner()
-    dlg = OrientationDialog()
-    result = dlg.ShowDialog(owner) if owner else dlg.ShowDialog()
-    if result == DialogResult.OK:
-        if dlg.rbVertical.Checked:
-            return "vertical"
-        else:
-            return "horizontal"
-    else:
+    @property
+    def selected_value(self):
+        for value, rb in self._choices:
+            if rb.Checked:
+                return value
         return None
 
-# =====================================
-# NEW: UI: Panel Type Picker
-# =====================================
-
-class PanelTypeDialog(Form):
-    def __init__(self):
-        # Basic form setup
-        self.Text = "Select Panel Type"
-        self.StartPosition = FormStartPosition.CenterScreen
-        self.FormBorderStyle = FormBorderStyle.FixedDialog
-        self.MaximizeBox = False
-        self.MinimizeBox = False
-        self.ClientSize = Size(600, 320)
-        self.TopMost = True
-
-        # Label
-        lbl = Label()
-        lbl.Text = "Select panel type:"
-        lbl.Location = Point(12, 12)
-        lbl.AutoSize = True
-        self.Controls.Add(lbl)
-
-        # Radio buttons (default: Backer)
-        self.rbBacker = RadioButton()
-        self.rbBacker.Text = "Backer Panels (1/8\" spacing)"
-        self.rbBacker.Checked = True
-        self.rbBacker.Location = Point(24, 40)
-        self.rbBacker.AutoSize = True
-        self.Controls.Add(self.rbBacker)
-
-        self.rbFullyFinished = RadioButton()
-        self.rbFullyFinished.Text = "Fully Finished Panels (3/4\" spacing)"
-        self.rbFullyFinished.Location = Point(24, 66)
-        self.rbFullyFinished.AutoSize = True
-        self.Controls.Add(self.rbFullyFinished)
-
-        # OK / Cancel buttons
-        btnOK = Button()
-        btnOK.Text = "OK"
-        btnOK.DialogResult = DialogResult.OK
-        btnOK.Location = Point(180, 130)
-
-        btnCancel = Button()
-        btnCancel.Text = "Cancel"
-        btnCancel.DialogResult = DialogResult.Cancel
-        btnCancel.Location = Point(260, 130)
-
-        self.AcceptButton = btnOK
-        self.CancelButton = btnCancel
-        self.Controls.Add(btnOK)
-        self.Controls.Add(btnCancel)
-
-
-def pick_panel_type():
-    """Show PanelTypeDialog and return spacing value (0.125 or 0.75); None if canceled."""
-    owner = get_revit_owner()
-    dlg = PanelTypeDialog()
-    result = dlg.ShowDialog(owner) if owner else dlg.ShowDialog()
-    if result == DialogResult.OK:
-        if dlg.rbBacker.Checked:
-            return 0.125  # 1/8" for backer panels
-        else:
-            return 0.75   # 3/4" for fully finished panels
-    else:
+    def show(self):
+        owner = get_revit_owner()
+        result = self.ShowDialog(owner) if owner else self.ShowDialog()
+        if result == DialogResult.OK:
+            return self.selected_value
         return None
 
-# =====================================
-# UI: Project Name Input Dialog
-# =====================================
-
 class ProjectNameDialog(Form):
     def __init__(self):
         # Basic form setup
@@ -218,20 +112,19 @@ class ProjectNameDialog(Form):
         self.MinimizeBox = False
         self.ClientSize = Size(600, 320)
         self.TopMost = True
+        self.SuspendLayout()
 
         # Label
         lbl = Label()
         lbl.Text = "Enter project name for output folder:"
         lbl.Location = Point(12, 12)
         lbl.AutoSize = True
-        self.Controls.Add(lbl)
 
         # TextBox for project name
         self.txtProjectName = TextBox()
         self.txtProjectName.Text = "PanelOptimization"
         self.txtProjectName.Location = Point(12, 40)
         self.txtProjectName.Size = Size(365, 20)
-        self.Controls.Add(self.txtProjectName)
 
         # OK / Cancel buttons
         btnOK = Button()
@@ -246,58 +139,242 @@ class ProjectNameDialog(Form):
 
         self.AcceptButton = btnOK
         self.CancelButton = btnCancel
-        self.Controls.Add(btnOK)
-        self.Controls.Add(btnCancel)
+        _add_controls(self, [lbl, self.txtProjectName, btnOK, btnCancel])
+
+        # Validate on OK without leaving the dialog
+        self.FormClosing += self._on_closing
+
+    def _on_closing(self, sender, e):
+        if self.DialogResult == DialogResult.OK and not self.txtProjectName.Text.strip():
+            e.Cancel = True
+            MessageBox.Show(
+                "Project name cannot be empty.",
+                "Invalid Input",
+                MessageBoxButtons.OK,
+                MessageBoxIcon.Warning
+            )
+            self.ActiveControl = self.txtProjectName
+            self.txtProjectName.SelectAll()
+
+class ProgressDialog(Form):
+    """Marquee dialog that runs work() on a worker thread once shown and
+    closes itself when it finishes; result/error hold the outcome and done
+    tells whether work() returned. It cannot be closed (e.g. Alt+F4) before."""
+    def __init__(self, title, message, work):
+        self.Text = title
+        self.StartPosition = FormStartPosition.CenterScreen
+        self.FormBorderStyle = FormBorderStyle.FixedDialog
+        self.ControlBox = False
+        self.ClientSize = Size(360, 80)
+        self.TopMost = True
+        self.SuspendLayout()
+
+        lbl = Label()
+        lbl.Text = message
+        lbl.Location = Point(12, 12)
+        lbl.AutoSize = True
+
+        bar = ProgressBar()
+        bar.Style = ProgressBarStyle.Marquee
+        bar.Location = Point(12, 40)
+        bar.Size = Size(336, 20)
+
+        _add_controls(self, [lbl, bar])
+
+        self._work = work
+        self.result = None
+        self.error = None
+        self.error_tb = None
+        self.done = False
+        # Start only once the handle exists, so the worker can always Close us
+        self.Shown += self._on_shown
+        self.FormClosing += self._on_closing
+
+    def _on_closing(self, sender, e):
+        # ControlBox=False only hides the close button; refuse every close
+        # until the worker is through, so it never outlives the dialog
+        if not self.done:
+            e.Cancel = True
+
+    def _on_shown(self, sender, args):
+        import threading
+        worker = threading.Thread(target=self._run)
+        worker.daemon = True
+        worker.start()
+
+    def _run(self):
+        try:
+            self.result = self._work()
+        except Exception as e:
+            self.error = e
+            self.error_tb = traceback.format_exc()  # lost once re-raised on the UI thread
+        finally:
+            self.done = True
+            self.BeginInvoke(MethodInvoker(self.Close))
+
+
+def _add_controls(form, controls):
+    """Add all controls in one AddRange and lay the form out once.
+    The form must be inside SuspendLayout()."""
+    form.Controls.AddRange(Array[Control](controls))
+    form.ResumeLayout(False)
+    form.PerformLayout()
+
+
+# =========================
+# Helpers: Revit window owner
+# =========================
+# The handle does not change during a run, so it is resolved once
+# (including a failed lookup) and shared by every dialog.
+_REVIT_OWNER = None
+_REVIT_OWNER_RESOLVED = False
 
 
+def get_revit_owner():
+    """Return an IWin32Window wrapper of Revit's main window; None on failure."""
+    global _REVIT_OWNER, _REVIT_OWNER_RESOLVED
+    if _REVIT_OWNER_RESOLVED:
+        return _REVIT_OWNER
+    try:
+        from System import IntPtr
+        # In pyRevit, __revit__ is already a UIApplication
+        uiapp = __revit__
+        hwnd = uiapp.MainWindowHandle
+        _REVIT_OWNER = WindowWrapper(IntPtr(hwnd))
+    except Exception as e:
+        print("Warning: could not retrieve Revit main window handle: {0}".format(e))
+        _REVIT_OWNER = None
+    _REVIT_OWNER_RESOLVED = True
+    return _REVIT_OWNER
+
+# =========================
+# UI: Folder Picker (click)
+# =========================
+
+# Default start folder, resolved once: Desktop; fallback: Home
+_HOME = os.path.expanduser("~")
+_DEFAULT_BROWSE_DIR = os.path.join(_HOME, "Desktop")
+if not os.path.isdir(_DEFAULT_BROWSE_DIR):
+    _DEFAULT_BROWSE_DIR = _HOME
+
+def pick_data_folder():
+    """Show a FolderBrowserDialog; default to Desktop, fallback to Home; return selected path or script dir."""
+    owner = get_revit_owner()
+    dialog = FolderBrowserDialog()
+    dialog.Description = "Select folder containing walls.csv and wall_openings.csv"
+    dialog.SelectedPath = _DEFAULT_BROWSE_DIR
+    result = dialog.ShowDialog(owner) if owner else dialog.ShowDialog()
+    if result == DialogResult.OK and dialog.SelectedPath and os.path.isdir(dialog.SelectedPath):
+        return dialog.SelectedPath
+    else:
+        # If user cancels, fall back to the folder where this script lives
+        return os.path.dirname(os.path.abspath(__file__))
+
+# =====================================
+# UI: Radio choice dialog (orientation, panel type)
+# =====================================
+
+# Orientations that send the user to the console config builder
+_CUSTOM_ORIENTATIONS = frozenset(["custom"])
+
+# Display name per panel spacing offered by pick_panel_type()
+_PANEL_TYPE_NAMES = {0.125: "Backer", 0.75: "Fully Finished"}
+
+def pick_orientation():
+    """Return 'vertical' or 'horizontal'; None if canceled."""
+    return RadioChoiceDialog(
+        "Select Panel Orientation", "Select panel orientation:",
+        [("vertical", "Vertical", True),
+         ("horizontal", "Horizontal", False)]
+    ).show()
+
+
+def pick_panel_type():
+    """Return spacing value (0.125 or 0.75); None if canceled."""
+    return RadioChoiceDialog(
+        "Select Panel Type", "Select panel type:",
+        [(0.125, "Backer Panels (1/8\" spacing)", True),          # 1/8" for backer panels
+         (0.75, "Fully Finished Panels (3/4\" spacing)", False)]  # 3/4" for fully finished panels
+    ).show()
+
+# =====================================
+# UI: Project Name Input Dialog
+# =====================================
+
 def get_project_name():
     """Show ProjectNameDialog and return project name; None if canceled."""
     owner = get_revit_owner()
-    while True:
-        dlg = ProjectNameDialog()
+    # The dialog rejects an empty name itself, so OK always carries a value
+    dlg = ProjectNameDialog()
+    try:
         result = dlg.ShowDialog(owner) if owner else dlg.ShowDialog()
         if result == DialogResult.OK:
-            project_name = dlg.txtProjectName.Text.strip()
-            if project_name:
-                return project_name
-            else:
-                # Show error and loop to ask again
-                MessageBox.Show(
-                    "Project name cannot be empty.",
-                    "Invalid Input",
-                    MessageBoxButtons.OK,
-                    MessageBoxIcon.Warning
-                )
+            return dlg.txtProjectName.Text.strip()
+        return None
+    finally:
+        dlg.Dispose()
+
+# =====================================
+# UI: Progress while the optimizer runs
+# =====================================
+
+def run_with_progress(title, message, work):
+    """Run work() off the UI thread behind a modal marquee dialog, keeping
+    Revit's window responsive; return its result or re-raise its error."""
+    owner = get_revit_owner()
+    dlg = ProgressDialog(title, message, work)
+    try:
+        if owner:
+            dlg.ShowDialog(owner)
         else:
-            return None
+            dlg.ShowDialog()
+    finally:
+        dlg.Dispose()
+    if not dlg.done:
+        raise RuntimeError("{0}: the dialog closed before the work finished".format(title))
+    if dlg.error is not None:
+        print(dlg.error_tb)
+        raise dlg.error
+    return dlg.result
 
 # =================
 # Utility functions
 # =================
 
 def _ensure_dir(path):
-    if not os.path.exists(path):
-        try:
-            os.makedirs(path)
-        except Exception as e:
+    # Just try mkdir (no exist_ok on IronPython 2.7); only stat if it fails
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if not os.path.isdir(path):
             print("Failed to create directory {0}: {1}".format(path, e))
 
-def _backup_file(path):
+_TIMESTAMP_FORMAT = "%Y%m%d_%H%M%S"
+
+def _timestamp():
+    from datetime import datetime
+    return datetime.now().strftime(_TIMESTAMP_FORMAT)
+
+def _backup_file(path, ts=None):
+    """Copy path to <name>_backup_<ts>.json; pass ts to share one stamp across files."""
     if os.path.exists(path):
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if ts is None:
+            ts = _timestamp()
         backup = path.replace(".json", "_backup_{0}.json".format(ts))
         try:
-            import shutil
-            shutil.copy(path, backup)
+            # A real copy: a hard link would share the inode, and the next
+            # in-place rewrite of path would change the "backup" with it
+            shutil.copyfile(path, backup)
         except Exception as e:
             print("Failed to backup file {0}: {1}".format(path, e))
 
+# Runs of characters Windows rejects in folder names (incl. control chars)
+_INVALID_FOLDER_CHARS = re.compile(r'[<>:"/\\|?*\x00-\x1f]+')
+
 def _sanitize_folder_name(name):
-    """Remove invalid characters from folder name."""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        name = name.replace(char, '_')
-    return name
+    """Replace each run of invalid characters with one "_"; drop the trailing
+    dots/spaces Windows would silently strip from the folder name."""
+    return _INVALID_FOLDER_CHARS.sub('_', name).rstrip(' .')
 
 # =====
 # Main
@@ -309,8 +386,7 @@ def main():
         print("EnableVisualStyles failed: {0}".format(e))
 
     # 1) Pick input folder (click)
-    input_dir = pick_data_folder()
-    _ensure_dir(input_dir)
+    input_dir = pick_data_folder()  # always an existing folder
 
     # 2) Get project name (type)
     project_name = get_project_name()
@@ -346,15 +422,17 @@ def main():
         return
 
     # 5) Create timestamped output directory
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = _timestamp()
     safe_project_name = _sanitize_folder_name(project_name)
     output_folder_name = "{0}_{1}".format(safe_project_name, timestamp)
     output_dir = os.path.join(input_dir, output_folder_name)
     _ensure_dir(output_dir)
+    # Every file the run writes, resolved once
+    panels_out = os.path.join(output_dir, "optimized_panel_placement.csv")
+    config_out = os.path.join(output_dir, "config_used.json")
 
     # 6) Build config based on orientation choice
-    presets = opt.get_preset_configs()
-    if orientation == "custom":
+    if orientation in _CUSTOM_ORIENTATIONS:
         MessageBox.Show(
             "Custom configuration selected.\n\n" +
             "You'll be asked to configure parameters in the console window.",
@@ -365,28 +443,28 @@ def main():
         config = opt.create_custom_config()
         config.project_name = project_name
     else:
-        config = presets[orientation]
+        config = opt.get_preset_config(orientation)
         config.project_name = project_name
     
     # NEW: Set panel spacing based on user selection
     config.panel_constraints.panel_spacing = panel_spacing
-    panel_type_name = "Backer" if panel_spacing == 0.125 else "Fully Finished"
+    panel_type_name = _PANEL_TYPE_NAMES.get(panel_spacing, "Fully Finished")
 
     # Show parameters in console and ask for confirmation
-    print("\n" + "=" * 70)
-    print("SELECTED CONFIGURATION: {} ({})".format(project_name, orientation.upper()))
-    print("Panel Type: {} ({}\")".format(panel_type_name, panel_spacing))
-    print("=" * 70)
+    print("\n".join([
+        "\n" + "=" * 70,
+        "SELECTED CONFIGURATION: {} ({})".format(project_name, orientation.upper()),
+        "Panel Type: {} ({}\")".format(panel_type_name, panel_spacing),
+        "=" * 70,
+    ]))
     opt.print_config_summary(config)
-    try:
-        user_input = raw_input  # IronPython
-    except NameError:
-        user_input = input  # CPython
-    print("\nOptions:")
-    print("1. Continue with these settings")
-    print("2. Edit parameters")
-    print("3. Cancel")
-    choice = user_input("\nChoice (1-3) [1]: ").strip() or "1"
+    print("\n".join([
+        "\nOptions:",
+        "1. Continue with these settings",
+        "2. Edit parameters",
+        "3. Cancel",
+    ]))
+    choice = opt.get_input("\nChoice (1-3) [1]: ").strip() or "1"
     if choice == "2":
         config = opt.edit_panel_constraints(config)
         config.project_name = project_name  # Restore project name
@@ -399,8 +477,12 @@ def main():
     walls_csv = os.path.join(input_dir, "walls.csv")
     openings_csv = os.path.join(input_dir, "wall_openings.csv")
 
-    # Validate inputs with message boxes
-    if not os.path.exists(walls_csv):
+    # Load inputs; opening the file is the existence check, message boxes report misses
+    try:
+        walls_rows = opt.load_walls_from_csv(walls_csv)
+    except IOError as e:
+        if e.errno != errno.ENOENT:
+            raise
         MessageBox.Show(
             "Could not find walls.csv in:\n{0}".format(input_dir),
             "Missing Input",
@@ -409,27 +491,40 @@ def main():
         )
         return
 
-    if not os.path.exists(openings_csv):
+    try:
+        openings_rows = opt.load_openings_from_csv(openings_csv, missing_ok=False)
+    except IOError as e:
+        if e.errno != errno.ENOENT:
+            raise
         MessageBox.Show(
             "Could not find wall_openings.csv in:\n{0}\n\nProceeding without openings.".format(input_dir),
             "Missing Input",
             MessageBoxButtons.OK,
             MessageBoxIcon.Warning
         )
+        openings_rows = []
 
     # 8) Run optimizer (output to OUTPUT directory)
-    walls_rows = opt.load_walls_from_csv(walls_csv)
-    openings_rows = opt.load_openings_from_csv(openings_csv)
     
     # UPDATED: process_all_walls now returns (panels_path, config_path)
-    panels_path, config_path = opt.process_all_walls(
-        walls_rows, openings_rows, output_dir,  # OUTPUT to timestamped folder
-        config.door_clearances,
-        config.window_clearances,
-        config.storefront_clearances,
-        config,  # Pass full config object
-        orientation  # Pass orientation
-    )
+    def run_optimizer():
+        return opt.process_all_walls(
+            walls_rows, openings_rows, output_dir,  # OUTPUT to timestamped folder
+            config.door_clearances,
+            config.window_clearances,
+            config.storefront_clearances,
+            config,  # Pass full config object
+            orientation,  # Pass orientation
+            panels_path=panels_out,
+            config_path=config_out
+        )
+
+    # Runs on a worker thread; the message boxes below stay on the UI thread.
+    # The per-wall log lines are held (no limit, so the worker never writes to
+    # the console) and go to the pyRevit console here once the run returns.
+    with opt.batched_stdout():
+        panels_path, config_path = run_with_progress(
+            "Greedy Optimizer", "Optimizing panel layout...", run_optimizer)
 
     # Config is automatically saved by process_all_walls
     if config_path:
@@ -437,8 +532,8 @@ def main():
     else:
         print("WARNING: Configuration was not saved")
 
-    # 9) Done message
-    if panels_path and os.path.exists(panels_path):
+    # 9) Done message (panels_path is None unless the CSV was written)
+    if panels_path:
         MessageBox.Show(
             "Optimization complete.\n\nPanel Type: {0}\nSpacing: {1}\"\n\nExported panels to:\n{2}".format(
                 panel_type_name, panel_spacing, output_dir),
@@ -7,12 +7,19 @@ FIXES:
 - Calculates the CENTER of the Structural Core layer.
 - Aligns the Panel's Center to the Core's Center.
 - Ensures correct placement regardless of Wall Location Line (Finish Face, Centerline, etc).
+
+PERFORMANCE:
+- Bottleneck is Revit API round-trips (element lookups, parameter reads/sets,
+  NewFamilyInstance, Regenerate), not Python math.
+- So: cache invariants per wall / wall type / symbol, batch Regenerate per wall,
+  and keep API calls out of per-panel and per-cutout code.
 """
 
 from Autodesk.Revit.DB import (
     FilteredElementCollector, Wall, Transaction, XYZ, Line,
     FamilySymbol, BuiltInCategory, BuiltInParameter, Transform, ElementId,
-    DirectShape, ElementTransformUtils, FamilyPlacementType
+    DirectShape, ElementTransformUtils, FamilyPlacementType,
+    CurveLoop, GeometryCreationUtilities
 )
 
 try:
@@ -26,6 +33,22 @@ import csv
 import os
 import json
 import math
+import threading
+import traceback
+from collections import namedtuple
+from itertools import groupby
+from operator import attrgetter, itemgetter
+
+try:
+    import Queue as queue  # IronPython 2.7
+except ImportError:
+    import queue
+
+# Optional faster JSON decoder for cutouts_json (CPython engines); stdlib otherwise
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 import clr
 clr.AddReference('System.Windows.Forms')
@@ -42,6 +65,7 @@ PANEL_FAMILY_NAME = None
 SHOW_CUTOUTS = True
 CUTOUT_THICKNESS_IN = 2.0
 CUTOUT_DEPTH_IN = 3.0
+CUTOUT_POP_OUT_IN = 2.0
 ALLOW_TYPE_PARAM_CHANGE = True
 
 # --- DEPTH SETTINGS ---
@@ -60,12 +84,38 @@ ROTATION_OVERRIDE_DEG = None
 WIDTH_PARAM_CANDIDATES = ["Width", "Panel Width", "W", "Overall Width", "Length", "L"]
 HEIGHT_PARAM_CANDIDATES = ["Height", "Panel Height", "H", "Overall Height", "Thickness", "Depth"]
 
+# Lower-cased once for _find_param_by_candidates
+_WIDTH_LC = tuple(c.lower() for c in WIDTH_PARAM_CANDIDATES)
+_HEIGHT_LC = tuple(c.lower() for c in HEIGHT_PARAM_CANDIDATES)
+_NAME_LC = ("name", "panel name", "mark")
+
 # Disable endcap extension to match exact drawing points
 USE_WALL_ENDCAP_EXTENSION = False
 PANEL_SIDE_SIGN = 1
 
+# Per-panel progress lines in the output window (errors are always reported)
+VERBOSE = False
+
 
 # ========== UTILITIES ==========
+# Log lines are buffered and written to the output window once, at the end of the run
+_LOG_LINES = []
+
+def _log(msg):
+    _LOG_LINES.append(msg)
+
+def _flush_log():
+    if _LOG_LINES:
+        print("\n".join(_LOG_LINES))
+        del _LOG_LINES[:]
+
+# VERBOSE-only progress templates, formatted only when VERBOSE is on
+_MSG_CUTOUT = "  [CUTOUT] Placed visualization pop-out."
+_MSG_HOSTED = "  [PLACE] Hosted: %s"
+_MSG_NON_HOSTED = "  [PLACE] Non-hosted: %s"
+_MSG_DS = "  [DS] Created: %s"
+_MSG_WALL = "\n--- Wall %s ---"
+
 def _pick_input_folder(default_dir=None):
     try:
         fbd = FolderBrowserDialog()
@@ -79,8 +129,10 @@ def _pick_input_folder(default_dir=None):
     return None
 
 def norm_id(val):
-    try: return str(int(float(val)))
-    except: return str(val).strip()
+    s = str(val).strip()
+    if s.isdigit(): return s.lstrip("0") or "0"  # plain integer id: no float round-trip
+    try: return str(int(float(s)))
+    except: return s
 
 def get_wall_by_id(wall_id):
     try:
@@ -93,8 +145,85 @@ def get_wall_by_id(wall_id):
 def _feet(val_inch):
     return float(val_inch) / 12.0
 
+def _to_float(val, default=0.0):
+    try: return float(val) if val not in (None, "") else default
+    except (TypeError, ValueError): return default
+
 # ========== GEOMETRY CORE ==========
 
+# Constant vectors, built once instead of per wall / per rotation
+_UP = XYZ(0, 0, 1)
+_ROT_AXIS_TIP = XYZ(0, 0, 10)
+
+# Layer widths per WallType id; every wall of a type shares its compound structure
+_CS_CACHE = {}
+
+def _get_core_geometry(w_type):
+    """
+    (total_width, ext_thickness, core_thickness) of the type's compound
+    structure, or None if it has none. Computed once per WallType.
+    """
+    key = w_type.Id.IntegerValue
+    if key in _CS_CACHE:
+        return _CS_CACHE[key]
+
+    core_geom = None
+    cs = w_type.GetCompoundStructure()
+    if cs:
+        total_width = cs.GetWidth()
+        layers = cs.GetLayers()
+        
+        ext_thickness = 0.0
+        core_thickness = 0.0
+        
+        # Iterate layers to find core boundaries
+        # Layers are ordered Exterior -> Interior
+        for i, layer in enumerate(layers):
+            if cs.IsCoreLayer(i):
+                core_thickness += layer.Width
+            elif cs.GetCoreBoundaryLayerIndex(0) > i: 
+                # This layer is before the core (Exterior side)
+                ext_thickness += layer.Width
+        core_geom = (total_width, ext_thickness, core_thickness)
+
+    _CS_CACHE[key] = core_geom
+    return core_geom
+
+def _core_center_offset(core_geom, loc_param_int):
+    """
+    Distance along the normal from the Location Line to the Core Center,
+    for a type's core geometry and a WALL_KEY_REF_PARAM value.
+    """
+    if core_geom is None:
+        return 0.0
+    total_width, ext_thickness, core_thickness = core_geom
+
+    # A. Core Center relative to Exterior Face
+    core_center_from_ext_face = ext_thickness + (core_thickness / 2.0)
+    
+    # B. Determine where the Location Line is relative to Exterior Face
+    # WALL_KEY_REF_PARAM values: 0=Wall Ctr, 2=Fin Face Ext, 3=Fin Face Int, etc.
+    loc_line_from_ext_face = 0.0
+    
+    if loc_param_int == 0: # Wall Centerline
+        loc_line_from_ext_face = total_width / 2.0
+    elif loc_param_int == 2: # Finish Face Exterior
+        loc_line_from_ext_face = 0.0
+    elif loc_param_int == 3: # Finish Face Interior
+        loc_line_from_ext_face = total_width
+    elif loc_param_int == 1: # Core Centerline
+        loc_line_from_ext_face = core_center_from_ext_face
+    elif loc_param_int == 4: # Core Face Exterior
+        loc_line_from_ext_face = ext_thickness
+    elif loc_param_int == 5: # Core Face Interior
+        loc_line_from_ext_face = ext_thickness + core_thickness
+        
+    # C. Calculate Final Offset
+    # If LocLine is at 0 (Ext) and Core is at 1, we need to move -1 (Inwards/Opposite to Normal).
+    # Offset = LocLine - CorePosition
+    return loc_line_from_ext_face - core_center_from_ext_face
+
+
 def get_wall_geometry_normalized(wall):
     """
     Returns consistent geometry and the CENTER offset of the structural core.
@@ -108,8 +237,7 @@ def get_wall_geometry_normalized(wall):
     normal = wall.Orientation
     
     # 2. Determine "Visual Right" direction
-    up = XYZ(0,0,1)
-    visual_right_dir = normal.CrossProduct(up)
+    visual_right_dir = normal.CrossProduct(_UP)
     
     # 3. Project p0/p1
     dot0 = p0.DotProduct(visual_right_dir)
@@ -130,65 +258,41 @@ def get_wall_geometry_normalized(wall):
     
     try:
         w_type = wall.WallType
-        cs = w_type.GetCompoundStructure()
+        param = wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM)
+        loc_param_int = param.AsInteger() if param else 0
         
-        if cs:
-            # A. Calculate Core Center relative to Exterior Face
-            total_width = cs.GetWidth()
-            layers = cs.GetLayers()
-            
-            ext_thickness = 0.0
-            core_thickness = 0.0
-            
-            # Iterate layers to find core boundaries
-            # Layers are ordered Exterior -> Interior
-            for i, layer in enumerate(layers):
-                if cs.IsCoreLayer(i):
-                    core_thickness += layer.Width
-                elif cs.GetCoreBoundaryLayerIndex(0) > i: 
-                    # This layer is before the core (Exterior side)
-                    ext_thickness += layer.Width
-            
-            # Distance from Ext Face to Core Center
-            core_center_from_ext_face = ext_thickness + (core_thickness / 2.0)
-            
-            # B. Determine where the Location Line is relative to Exterior Face
-            # WALL_KEY_REF_PARAM values: 0=Wall Ctr, 2=Fin Face Ext, 3=Fin Face Int, etc.
-            param = wall.get_Parameter(BuiltInParameter.WALL_KEY_REF_PARAM)
-            loc_param_int = param.AsInteger() if param else 0
-            
-            loc_line_from_ext_face = 0.0
-            
-            if loc_param_int == 0: # Wall Centerline
-                loc_line_from_ext_face = total_width / 2.0
-            elif loc_param_int == 2: # Finish Face Exterior
-                loc_line_from_ext_face = 0.0
-            elif loc_param_int == 3: # Finish Face Interior
-                loc_line_from_ext_face = total_width
-            elif loc_param_int == 1: # Core Centerline
-                loc_line_from_ext_face = core_center_from_ext_face
-            elif loc_param_int == 4: # Core Face Exterior
-                loc_line_from_ext_face = ext_thickness
-            elif loc_param_int == 5: # Core Face Interior
-                loc_line_from_ext_face = ext_thickness + core_thickness
-                
-            # C. Calculate Final Offset
-            # If LocLine is at 0 (Ext) and Core is at 1, we need to move -1 (Inwards/Opposite to Normal).
-            # Offset = LocLine - CorePosition
-            core_center_offset = loc_line_from_ext_face - core_center_from_ext_face
+        core_center_offset = _core_center_offset(_get_core_geometry(w_type), loc_param_int)
             
     except Exception as e: 
-        print("Warning - Core Calc Failed: {}".format(e))
+        _log("Warning - Core Calc Failed: {}".format(e))
         pass
 
     return visual_left, visual_right, normalized_dir, normal, core_center_offset
 
 
-def compute_panel_base_point(wall, panel, extra_z_offset_in=0.0):
+# Per-wall invariants for placement, computed once per wall
+# depth_offset: core-centre offset + family-origin and manual depth adjustments
+WallGeom = namedtuple("WallGeom", "left_used right_used wall_dir wall_normal base_z depth_offset")
+
+def _wall_base_z(wall):
     """
-    Calculates insertion point aligning Panel CENTER to Wall CORE CENTER.
+    Bottom of the wall: base level + base offset. Falls back to the bounding
+    box (an O(geometry) call) only when the wall has no base level.
+    """
+    try:
+        lvl_id = wall.get_Parameter(BuiltInParameter.WALL_BASE_CONSTRAINT).AsElementId()
+        lvl = doc.GetElement(lvl_id) if lvl_id and lvl_id.IntegerValue > 0 else None
+        if lvl:
+            off = wall.get_Parameter(BuiltInParameter.WALL_BASE_OFFSET)
+            # ProjectElevation is in internal coordinates, like the bounding box was
+            return lvl.ProjectElevation + (off.AsDouble() if off else 0.0)
+    except: pass
+    return wall.get_BoundingBox(None).Min.Z
+
+def get_wall_geom(wall):
+    """
+    Collects everything compute_panel_base_point needs from the wall in one go.
     """
-    
     vis_left, vis_right, wall_dir, wall_normal, core_center_off = get_wall_geometry_normalized(wall)
     
     # --- Endcap Extension (Disabled) ---
@@ -199,50 +303,68 @@ def compute_panel_base_point(wall, panel, extra_z_offset_in=0.0):
         left_used = vis_left - (wall_dir * half_thk)
         right_used = vis_right + (wall_dir * half_thk)
 
-    # --- Read Panel Data ---
-    x_in = float(panel.get("x_in", 0.0) or 0.0)
-    y_in = float(panel.get("y_in", 0.0) or 0.0)
+    # --- DEPTH ALIGNMENT LOGIC (CORE CENTER) ---
+    # Goal: Panel Center = Core Center. Same for every panel on the wall.
+    depth_offset = core_center_off
+    p_thickness_ft = _feet(PANEL_THICKNESS_IN)
     
-    x_ref = (panel.get("x_ref", PANEL_COORD_DEFAULT_REF) or PANEL_COORD_DEFAULT_REF).lower().strip()
+    # Adjust based on where the Family Origin is defined
+    origin = FAMILY_ORIGIN_LOCATION.lower()
+    if origin == "center":
+        # Origin is Center. Core is Center. No adjustment needed.
+        pass
+    elif origin == "front":
+        # Origin is Front. We want Center at Core Center.
+        # So we move Origin BACK by half thickness.
+        depth_offset -= (p_thickness_ft / 2.0)
+    elif origin == "back":
+        # Origin is Back. We want Center at Core Center.
+        # So we move Origin FORWARD by half thickness.
+        depth_offset += (p_thickness_ft / 2.0)
+
+    # Manual Nudge
+    depth_offset += _feet(MANUAL_DEPTH_OFFSET_IN)
+
+    return WallGeom(left_used, right_used, wall_dir, wall_normal, _wall_base_z(wall), depth_offset)
+
+
+def _resolve_x_ref(panel):
+    x_ref = (panel.x_ref or PANEL_COORD_DEFAULT_REF).lower().strip()
     if X_REF_OVERRIDE == "start": x_ref = "start"
     if X_REF_OVERRIDE == "end": x_ref = "end"
+    return x_ref
+
+
+def compute_panel_base_point(geom, panel, extra_z_offset_in=0.0):
+    """
+    Calculates insertion point aligning Panel CENTER to Wall CORE CENTER.
+    """
+    wall_dir = geom.wall_dir
+    wall_normal = geom.wall_normal
+
+    # --- Read Panel Data (numbers already coerced at load) ---
+    x_in = panel.x_in
+    y_in = panel.y_in
+    
+    x_ref = _resolve_x_ref(panel)
 
     x_ft = _feet(x_in)
     y_ft = _feet(y_in)
 
     # --- XY Location ---
     if x_ref == "start":
-        pt_xy = left_used + (wall_dir * x_ft)
+        pt_xy = geom.left_used + (wall_dir * x_ft)
     else:
-        pt_xy = right_used - (wall_dir * x_ft)
+        pt_xy = geom.right_used - (wall_dir * x_ft)
 
     # --- Z Location ---
-    bb = wall.get_BoundingBox(None)
-    base_z = bb.Min.Z + y_ft
+    base_z = geom.base_z + y_ft
     base_point_loc = XYZ(pt_xy.X, pt_xy.Y, base_z)
     
-    # --- DEPTH ALIGNMENT LOGIC (CORE CENTER) ---
-    # Goal: Panel Center = Core Center
-    
-    calculated_offset = core_center_off
-    p_thickness_ft = _feet(PANEL_THICKNESS_IN)
-    
-    # Adjust based on where the Family Origin is defined
-    if FAMILY_ORIGIN_LOCATION.lower() == "center":
-        # Origin is Center. Core is Center. No adjustment needed.
-        pass
-    elif FAMILY_ORIGIN_LOCATION.lower() == "front":
-        # Origin is Front. We want Center at Core Center.
-        # So we move Origin BACK by half thickness.
-        calculated_offset -= (p_thickness_ft / 2.0)
-    elif FAMILY_ORIGIN_LOCATION.lower() == "back":
-        # Origin is Back. We want Center at Core Center.
-        # So we move Origin FORWARD by half thickness.
-        calculated_offset += (p_thickness_ft / 2.0)
-
-    # Manual Nudge + Visual Pop-out
-    calculated_offset += _feet(MANUAL_DEPTH_OFFSET_IN)
-    calculated_offset += _feet(extra_z_offset_in)
+    # --- Depth: per-wall alignment (see get_wall_geom) + Visual Pop-out ---
+    calculated_offset = geom.depth_offset
+    if extra_z_offset_in:
+        calculated_offset += _feet(extra_z_offset_in)
 
     # Final Point
     final_point = base_point_loc + (wall_normal * calculated_offset)
@@ -251,24 +373,62 @@ def compute_panel_base_point(wall, panel, extra_z_offset_in=0.0):
 
 
 # ========== PLACEMENT ==========
-def place_panel_family(wall, panel, symbol, extra_z_offset_in=0.0):
-    if not ensure_symbol_active(symbol): return None
-    
-    try:
-        pt, w_dir, w_norm = compute_panel_base_point(wall, panel, extra_z_offset_in)
-    except Exception as e:
-        print("[ERROR] Geometry calc failed: {0}".format(e))
-        return None
+# (inst, wall_normal, insertion_point, rotation_deg) awaiting _flush_orientation()
+_PENDING_ORIENT = []
+
+def _orient_instance(inst, w_norm, pt, rot_deg):
+    # ORIENTATION LOGIC
+    # We want the panel facing EXTERIOR (Positive Dot Product)
+    if inst.CanFlipFacing:
+        try:
+            inst_facing = inst.FacingOrientation
+            dot = w_norm.DotProduct(inst_facing)
+            if dot < -0.01:
+                inst.flipFacing()
+        except: pass
+
+    # Rotation
+    if abs(rot_deg) > 0.001:
+        try:
+            # Pivot on pt, the point the instance was created at; reading
+            # inst.Location.Point instead would need a regenerate first
+            axis = Line.CreateBound(pt, pt + _ROT_AXIS_TIP)
+            ElementTransformUtils.RotateElement(doc, inst.Id, axis, math.radians(rot_deg))
+        except: pass
+
+def _flush_orientation():
+    """One Regenerate for everything placed since the last flush, then face/rotate each."""
+    if not _PENDING_ORIENT:
+        return
+    doc.Regenerate()
+    for args in _PENDING_ORIENT:
+        _orient_instance(*args)
+    del _PENDING_ORIENT[:]
+
+def place_panel_family(wall, geom, panel, symbol, extra_z_offset_in=0.0, base_point=None):
+    """
+    base_point: insertion point already computed by the caller, if any.
+    symbol must already be active (main() activates it once).
+    """
+    if base_point is not None:
+        pt, w_dir, w_norm = base_point, geom.wall_dir, geom.wall_normal
+    else:
+        try:
+            pt, w_dir, w_norm = compute_panel_base_point(geom, panel, extra_z_offset_in)
+        except Exception as e:
+            _log("[ERROR] Geometry calc failed: {0}".format(e))
+            return None
 
     inst = None
     
     # 1. Place Instance
     try:
         inst = doc.Create.NewFamilyInstance(pt, symbol, wall, StructuralType.NonStructural)
-        if extra_z_offset_in > 0:
-            print("  [CUTOUT] Placed visualization pop-out.")
-        else:
-            print("  [PLACE] Hosted: {0}".format(panel.get("panel_name", "")))
+        if VERBOSE:
+            if extra_z_offset_in > 0:
+                _log(_MSG_CUTOUT)
+            else:
+                _log(_MSG_HOSTED % panel.panel_name)
     except: pass
         
     if not inst:
@@ -278,42 +438,26 @@ def place_panel_family(wall, panel, symbol, extra_z_offset_in=0.0):
                 inst = doc.Create.NewFamilyInstance(pt, symbol, lvl, StructuralType.NonStructural)
             else:
                 inst = doc.Create.NewFamilyInstance(pt, symbol, StructuralType.NonStructural)
-            print("  [PLACE] Non-hosted: {0}".format(panel.get("panel_name", "")))
+            if VERBOSE: _log(_MSG_NON_HOSTED % panel.panel_name)
         except Exception as e:
-            print("[ERROR] Placement failed: {0}".format(e))
+            _log("[ERROR] Placement failed: {0}".format(e))
             return None
 
-    doc.Regenerate()
-    
-    # 2. ORIENTATION LOGIC
-    # We want the panel facing EXTERIOR (Positive Dot Product)
-    if inst and inst.CanFlipFacing:
-        try:
-            inst_facing = inst.FacingOrientation
-            dot = w_norm.DotProduct(inst_facing)
-            if dot < -0.01:
-                inst.flipFacing()
-        except: pass
-
-    # 3. Rotation
+    # 2-3. Facing + rotation are deferred to _flush_orientation(), which runs once
+    # per wall after a single Regenerate, so FacingOrientation is up to date
     rot_deg = 0.0
     if ROTATION_OVERRIDE_DEG is not None:
         rot_deg = ROTATION_OVERRIDE_DEG
     elif USE_CSV_ROTATION:
-        try: rot_deg = float(panel.get("rotation_deg", 0.0) or 0.0)
-        except: pass
-
-    if abs(rot_deg) > 0.001:
-        try:
-            axis = Line.CreateBound(pt, pt + XYZ(0,0,10))
-            ElementTransformUtils.RotateElement(doc, inst.Id, axis, math.radians(rot_deg))
-        except: pass
+        rot_deg = panel.rotation_deg
+    _PENDING_ORIENT.append((inst, w_norm, pt, rot_deg))
 
-    # 4. Params
-    set_size_parameters(inst, panel["width_in"], panel["height_in"], symbol)
+    # 4. Params (one read of the instance's parameter names for all lookups)
+    idx = _build_param_index(inst)
+    set_size_parameters(inst, panel.width_in, panel.height_in, symbol, idx)
     try:
-        p = _find_param_by_candidates(inst, ["Name", "Panel Name", "Mark"])
-        if p and not p.IsReadOnly: p.Set(panel.get("panel_name",""))
+        p = _find_param_by_candidates(inst, _NAME_LC, idx)
+        if p and not p.IsReadOnly: p.Set(panel.panel_name)
     except: pass
     
     return inst
@@ -331,21 +475,34 @@ def get_family_name(symbol):
     try: return symbol.Family.Name
     except: return "Unknown"
 
-def get_all_family_symbols():
-    collector = FilteredElementCollector(doc).OfClass(FamilySymbol)
+# {family_name: [symbols]}, built by one collector pass on first use
+_FAMILY_SYMBOL_CACHE = None
+
+def _build_family_symbol_cache():
     families_dict = {}
-    for symbol in collector:
-        family_name = get_family_name(symbol)
+    names_by_family_id = {}  # Family.Name is an API round-trip; resolve it once per family
+    for symbol in FilteredElementCollector(doc).OfClass(FamilySymbol):
+        try: fam_id = symbol.Family.Id.IntegerValue
+        except: fam_id = None
+        family_name = names_by_family_id.get(fam_id)
+        if family_name is None:
+            family_name = get_family_name(symbol)
+            if fam_id is not None: names_by_family_id[fam_id] = family_name
         families_dict.setdefault(family_name, []).append(symbol)
     return families_dict
 
+def get_all_family_symbols():
+    global _FAMILY_SYMBOL_CACHE
+    if _FAMILY_SYMBOL_CACHE is None:
+        _FAMILY_SYMBOL_CACHE = _build_family_symbol_cache()
+    return _FAMILY_SYMBOL_CACHE
+
 def get_panel_family_symbol(family_name):
     from pyrevit import forms
-    if family_name:
-        collector = FilteredElementCollector(doc).OfClass(FamilySymbol)
-        for s in collector:
-            if get_family_name(s) == family_name: return s, False
     families_dict = get_all_family_symbols()
+    if family_name:
+        s = families_dict.get(family_name, [None])[0]
+        if s: return s, False
     family_names = sorted(families_dict.keys())
     family_names.insert(0, "< Use DirectShape (3D Solid Panels) >")
     selected_family = forms.SelectFromList.show(family_names, title="Select Panel Placement Method", button_name="Select", multiselect=False)
@@ -366,26 +523,53 @@ def ensure_symbol_active(symbol):
         return True
     except: return False
 
-def _find_param_by_candidates(element, candidates):
-    for p in element.Parameters:
-        try:
-            nm = p.Definition.Name
-            if nm and any(nm.lower() == cand.lower() for cand in candidates): return p
-        except: continue
-    lower_cands = [c.lower() for c in candidates]
+def _build_param_index(element):
+    """
+    Reads every parameter name once (Definition.Name is a slow API call).
+    Returns ({lower name: (position, param)}, [(lower name, param)] in element order).
+    """
+    by_name = {}
+    ordered = []
     for p in element.Parameters:
-        try:
-            nm = p.Definition.Name
-            if nm and any(c in nm.lower() for c in lower_cands): return p
+        try: nm = p.Definition.Name
         except: continue
+        if not nm: continue
+        nm = nm.lower()
+        by_name.setdefault(nm, (len(ordered), p))
+        ordered.append((nm, p))
+    return by_name, ordered
+
+def _find_param_by_candidates(element, lower_cands, index=None):
+    """lower_cands: lower-cased candidate names, e.g. _WIDTH_LC."""
+    by_name, ordered = index or _build_param_index(element)
+    # Exact match first; earliest parameter in element order wins, as before
+    hits = [by_name[c] for c in lower_cands if c in by_name]
+    if hits: return min(hits, key=itemgetter(0))[1]
+    for nm, p in ordered:
+        if any(c in nm for c in lower_cands): return p
     return None
 
-def set_size_parameters(inst, width_in, height_in, symbol=None):
+# Type-level (width, height) parameters per FamilySymbol id; the symbol is the
+# same element for every panel, so its Parameters can be reused
+_TYPE_SIZE_PARAMS = {}
+
+def _type_size_params(symbol):
+    key = symbol.Id.IntegerValue
+    hit = _TYPE_SIZE_PARAMS.get(key)
+    if hit is None:
+        sym_idx = _build_param_index(symbol)
+        hit = (_find_param_by_candidates(symbol, _WIDTH_LC, sym_idx),
+               _find_param_by_candidates(symbol, _HEIGHT_LC, sym_idx))
+        _TYPE_SIZE_PARAMS[key] = hit
+    return hit
+
+def set_size_parameters(inst, width_in, height_in, symbol=None, index=None):
     width_ft = _feet(width_in)
     height_ft = _feet(height_in)
     changed = False
-    w_param = _find_param_by_candidates(inst, WIDTH_PARAM_CANDIDATES)
-    h_param = _find_param_by_candidates(inst, HEIGHT_PARAM_CANDIDATES)
+    idx = index or _build_param_index(inst)
+    w_param = _find_param_by_candidates(inst, _WIDTH_LC, idx)
+    h_param = _find_param_by_candidates(inst, _HEIGHT_LC, idx)
     try:
         if w_param and not w_param.IsReadOnly:
             w_param.Set(width_ft)
@@ -396,8 +580,7 @@ def set_size_parameters(inst, width_in, height_in, symbol=None):
     except: pass
     if not changed and ALLOW_TYPE_PARAM_CHANGE and symbol:
         try:
-            wtp = _find_param_by_candidates(symbol, WIDTH_PARAM_CANDIDATES)
-            htp = _find_param_by_candidates(symbol, HEIGHT_PARAM_CANDIDATES)
+            wtp, htp = _type_size_params(symbol)
             if wtp and not wtp.IsReadOnly: wtp.Set(width_ft)
             if htp and not htp.IsReadOnly: htp.Set(height_ft)
         except: pass
@@ -410,56 +593,151 @@ def get_wall_base_level(wall):
     try: return FilteredElementCollector(doc).OfCategory(BuiltInCategory.OST_Levels).FirstElement()
     except: return None
 
-def create_panel_as_direct_shape(wall, panel):
+def create_panel_as_direct_shape(geom, panel):
     try:
-        pt, w_dir, w_norm = compute_panel_base_point(wall, panel)
-        w_ft = _feet(panel.get("width_in",0))
-        h_ft = _feet(panel.get("height_in",0))
+        pt, w_dir, w_norm = compute_panel_base_point(geom, panel)
+        w_ft = _feet(panel.width_in)
+        h_ft = _feet(panel.height_in)
         thk = 1.0/12.0
+        # Front face from the edge vectors along the wall and up,
+        # extruded through the thickness into one solid (not 12 wireframe edges)
+        ex = w_dir * w_ft
+        ey = XYZ(0,0,h_ft)
         v1 = pt + (w_norm * 0.01)
-        v2 = v1 + (w_dir * w_ft)
-        v3 = v2 + XYZ(0,0,h_ft)
-        v4 = v1 + XYZ(0,0,h_ft)
-        v5 = pt + (w_norm * (0.01+thk))
-        v6 = v5 + (w_dir * w_ft)
-        v7 = v6 + XYZ(0,0,h_ft)
-        v8 = v5 + XYZ(0,0,h_ft)
-        lines = [Line.CreateBound(v1,v2), Line.CreateBound(v2,v3), Line.CreateBound(v3,v4), Line.CreateBound(v4,v1),
-                 Line.CreateBound(v5,v6), Line.CreateBound(v6,v7), Line.CreateBound(v7,v8), Line.CreateBound(v8,v5),
-                 Line.CreateBound(v1,v5), Line.CreateBound(v2,v6), Line.CreateBound(v3,v7), Line.CreateBound(v4,v8)]
+        v2 = v1 + ex
+        v3 = v2 + ey
+        v4 = v1 + ey
+        loop = CurveLoop()
+        for a, b in ((v1,v2), (v2,v3), (v3,v4), (v4,v1)):
+            loop.Append(Line.CreateBound(a, b))
+        solid = GeometryCreationUtilities.CreateExtrusionGeometry([loop], w_norm, thk)
         ds = DirectShape.CreateElement(doc, ElementId(int(BuiltInCategory.OST_GenericModel)))
-        ds.SetShape(lines)
-        ds.Name = panel.get("panel_name", "PanelSolid")
-        print("  [DS] Created: {0}".format(ds.Name))
+        ds.SetShape([solid])
+        name = panel.panel_name or "PanelSolid"
+        ds.Name = name
+        if VERBOSE: _log(_MSG_DS % name)  # local name, not a ds.Name read-back
         return ds
     except Exception as e:
-        print("DS Fail: {0}".format(e))
+        _log("DS Fail: {0}".format(e))
         return None
 
-def create_cutout_visualization(wall, panel, cutout_data, symbol, use_ds):
+def _cutout_key(cutout_data):
+    """Position/size key used to skip duplicate cutouts on one panel."""
+    try: return tuple(round(_to_float(cutout_data.get(k)), 3) for k in ("x_in", "y_in", "width_in", "height_in"))
+    except AttributeError: return None
+
+def create_cutout_visualization(wall, geom, panel, panel_pt, cutout_data, symbol, use_ds):
+    """panel_pt: the host panel's insertion point; the cutout is offset from it."""
     if not use_ds and symbol:
         try:
-            c_x = float(cutout_data.get("x_in",0))
-            c_y = float(cutout_data.get("y_in",0))
-            g_x = float(panel.get("x_in",0)) + c_x
-            g_y = float(panel.get("y_in",0)) + c_y
-            fake_panel = panel.copy()
-            fake_panel.update({
-                "panel_name": "CUT_" + str(cutout_data.get("id","")),
-                "x_in": g_x, "y_in": g_y,
-                "width_in": cutout_data.get("width_in",0),
-                "height_in": cutout_data.get("height_in",0),
-                "cutouts": []
-            })
+            c_x = _to_float(cutout_data.get("x_in"))
+            c_y = _to_float(cutout_data.get("y_in"))
+            # Same point compute_panel_base_point would give for the shifted panel
+            along = geom.wall_dir * _feet(c_x)
+            if _resolve_x_ref(panel) != "start": along = along.Negate()
+            cut_pt = panel_pt + along + XYZ(0, 0, _feet(c_y)) + geom.wall_normal * _feet(CUTOUT_POP_OUT_IN)
+            fake_panel = panel._replace(
+                panel_name="CUT_" + str(cutout_data.get("id","")),
+                x_in=panel.x_in + c_x, y_in=panel.y_in + c_y,
+                width_in=_to_float(cutout_data.get("width_in")),
+                height_in=_to_float(cutout_data.get("height_in")),
+                cutouts=()
+            )
             
             # [FIX] Visual pop-out for cutouts
-            place_panel_family(wall, fake_panel, symbol, extra_z_offset_in=2.0)
+            place_panel_family(wall, geom, fake_panel, symbol, extra_z_offset_in=CUTOUT_POP_OUT_IN, base_point=cut_pt)
             return True
         except: pass
     return False
 
+# ========== CSV ==========
+# One placement CSV row; a tuple is smaller than a dict and reads by attribute
+PanelRow = namedtuple("PanelRow", "wall_id x_in y_in width_in height_in x_ref panel_name rotation_deg cutouts")
+
+def iter_panels(panels_path):
+    """
+    Yields PanelRows from the placement CSV one row at a time, so placement
+    can start without holding every row and its cutouts in memory.
+    """
+    wall_ids = {}  # raw wall_id -> norm_id(raw); every row of a wall repeats its id
+    with open(panels_path, 'r') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try: cutouts = _json_loads(row.get("cutouts_json") or "[]")
+            except: cutouts = []
+            raw_id = row.get("wall_id")
+            wid = wall_ids.get(raw_id)
+            if wid is None:
+                wid = wall_ids[raw_id] = norm_id(raw_id)
+            # Coerce numbers once here; placement reads them as floats
+            yield PanelRow(
+                wid,
+                _to_float(row.get("x_in")),
+                _to_float(row.get("y_in")),
+                _to_float(row.get("width_in")),
+                _to_float(row.get("height_in")),
+                row.get("x_ref"),
+                row.get("panel_name") or "",
+                _to_float(row.get("rotation_deg")),
+                cutouts
+            )
+
+PREFETCH_ROWS = 2000  # Parsed rows the reader thread may run ahead of placement
+
+class PanelPrefetch(object):
+    """
+    Runs iter_panels() on a worker thread and hands rows over through a bounded
+    queue. Parsing and JSON decoding overlap with the pickers and with placement;
+    Revit API calls stay on the calling thread. Always close() when done.
+    """
+    _DONE = object()
+
+    def __init__(self, panels_path, maxsize=PREFETCH_ROWS):
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._error = None
+        self._error_tb = None
+        self._worker = threading.Thread(target=self._run, args=(panels_path,))
+        self._worker.daemon = True
+        self._worker.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, panels_path):
+        rows = iter_panels(panels_path)
+        try:
+            for row in rows:
+                if not self._put(row): break
+        except Exception as e:
+            self._error = e
+            self._error_tb = traceback.format_exc()  # lost once re-raised on this thread
+        finally:
+            rows.close()  # closes the CSV even if we stopped early
+            self._put(self._DONE)
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is self._DONE: break
+            yield item
+        if self._error is not None:
+            _log("[ERROR] Reading panels CSV failed:\n" + self._error_tb)
+            raise self._error
+
+    def close(self):
+        """Stop the reader (e.g. user cancelled) so it releases the file."""
+        self._stop.set()
+
 # ========== MAIN ==========
 def main():
+    global X_REF_OVERRIDE, ROTATION_OVERRIDE_DEG
     print("--- PANEL PLACEMENT: CORE CENTER ALIGNMENT ---")
     
     if USE_FOLDER_PICKER:
@@ -474,76 +752,99 @@ def main():
         print("CSV not found: " + panels_path)
         return
 
-    panels = []
-    with open(panels_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try: cutouts = json.loads(row.get("cutouts_json","[]"))
-            except: cutouts = []
-            p = {
-                "wall_id": norm_id(row.get("wall_id")),
-                "x_in": row.get("x_in"),
-                "y_in": row.get("y_in"),
-                "width_in": row.get("width_in"),
-                "height_in": row.get("height_in"),
-                "x_ref": row.get("x_ref"),
-                "panel_name": row.get("panel_name"),
-                "rotation_deg": row.get("rotation_deg"),
-                "cutouts": cutouts
-            }
-            panels.append(p)
-
-    print("Loaded {0} panels.".format(len(panels)))
-    
-    sym, use_ds = get_panel_family_symbol(PANEL_FAMILY_NAME)
-    if not sym and not use_ds: return
+    # Parse the CSV on a worker thread while the pickers below are open
+    rows = PanelPrefetch(panels_path)
+    t = None
+    try:
+        sym, use_ds = get_panel_family_symbol(PANEL_FAMILY_NAME)
+        if not sym and not use_ds: return
 
-    from pyrevit import forms
-    global X_REF_OVERRIDE, ROTATION_OVERRIDE_DEG
+        from pyrevit import forms
     
-    if not use_ds:
-        print("Using Family: " + get_family_name(sym))
+        if not use_ds:
+            print("Using Family: " + get_family_name(sym))
         
-        xref_ops = ["Use CSV Default", "Force Start (Left)", "Force End (Right)"]
-        res = forms.SelectFromList.show(xref_ops, button_name="Set X Ref", multiselect=False)
-        if res == xref_ops[1]: X_REF_OVERRIDE = "start"
-        elif res == xref_ops[2]: X_REF_OVERRIDE = "end"
+            xref_ops = ["Use CSV Default", "Force Start (Left)", "Force End (Right)"]
+            res = forms.SelectFromList.show(xref_ops, button_name="Set X Ref", multiselect=False)
+            if res == xref_ops[1]: X_REF_OVERRIDE = "start"
+            elif res == xref_ops[2]: X_REF_OVERRIDE = "end"
         
-        rot_ops = ["Use CSV Rotation", "Force 0", "Force 90", "Force -90", "Force 180"]
-        res = forms.SelectFromList.show(rot_ops, button_name="Set Rotation", multiselect=False)
-        if res == rot_ops[1]: ROTATION_OVERRIDE_DEG = 0.0
-        elif res == rot_ops[2]: ROTATION_OVERRIDE_DEG = 90.0
-        elif res == rot_ops[3]: ROTATION_OVERRIDE_DEG = -90.0
-        elif res == rot_ops[4]: ROTATION_OVERRIDE_DEG = 180.0
-
-    # Group by wall
-    panels_map = {}
-    for p in panels:
-        panels_map.setdefault(p["wall_id"], []).append(p)
-
-    t = Transaction(doc, "Place Panels")
-    t.Start()
+            rot_ops = ["Use CSV Rotation", "Force 0", "Force 90", "Force -90", "Force 180"]
+            res = forms.SelectFromList.show(rot_ops, button_name="Set Rotation", multiselect=False)
+            if res == rot_ops[1]: ROTATION_OVERRIDE_DEG = 0.0
+            elif res == rot_ops[2]: ROTATION_OVERRIDE_DEG = 90.0
+            elif res == rot_ops[3]: ROTATION_OVERRIDE_DEG = -90.0
+            elif res == rot_ops[4]: ROTATION_OVERRIDE_DEG = 180.0
+
+        t = Transaction(doc, "Place Panels")
+        t.Start()
+
+        # Every panel and cutout uses this one symbol: activate it once up front
+        if not use_ds:
+            if not ensure_symbol_active(sym):
+                _log("[ERROR] Could not activate family type: " + get_element_name(sym))
+                t.RollBack()
+                return
+            doc.Regenerate()
     
-    count = 0
-    for wid, wall_panels in panels_map.items():
-        wall = get_wall_by_id(wid)
-        if not wall:
-            print("Wall {0} not found.".format(wid))
-            continue
-            
-        print("\n--- Wall {0} ---".format(wid))
-        for p in wall_panels:
-            if use_ds:
-                res = create_panel_as_direct_shape(wall, p)
+        count = 0
+        loaded = 0
+        wall_cache = {}  # wall_id -> (wall, geom), in case a wall's rows are split up
+        # The optimizer writes each wall's rows together, so consecutive runs are wall groups
+        for wid, wall_panels in groupby(rows, key=attrgetter("wall_id")):
+            if wid in wall_cache:
+                wall, geom = wall_cache[wid]
             else:
-                res = place_panel_family(wall, p, sym)
-            if res: count += 1
-            if SHOW_CUTOUTS:
-                for c in p["cutouts"]:
-                    create_cutout_visualization(wall, p, c, sym, use_ds)
+                wall = get_wall_by_id(wid)
+                geom = None
+                if not wall:
+                    _log("Wall {0} not found.".format(wid))
+                else:
+                    try:
+                        geom = get_wall_geom(wall)
+                    except Exception as e:
+                        _log("[ERROR] Geometry calc failed: {0}".format(e))
+                wall_cache[wid] = (wall, geom)
+            if geom is None:
+                loaded += sum(1 for _ in wall_panels)
+                continue
+            
+            if VERBOSE: _log(_MSG_WALL % wid)
+            for p in wall_panels:
+                loaded += 1
+                pt = None
+                if use_ds:
+                    res = create_panel_as_direct_shape(geom, p)
+                else:
+                    # Computed once here; the panel's cutouts are placed relative to it
+                    try:
+                        pt = compute_panel_base_point(geom, p)[0]
+                    except Exception as e:
+                        _log("[ERROR] Geometry calc failed: {0}".format(e))
+                        continue
+                    res = place_panel_family(wall, geom, p, sym, base_point=pt)
+                if res: count += 1
+                if SHOW_CUTOUTS and not use_ds:
+                    seen = set()
+                    for c in p.cutouts:
+                        # Identical cutouts would only stack duplicate instances
+                        key = _cutout_key(c)
+                        if key is not None:
+                            if key in seen: continue
+                            seen.add(key)
+                        create_cutout_visualization(wall, geom, p, pt, c, sym, use_ds)
+            _flush_orientation()
             
-    t.Commit()
-    print("\nDone. Placed {0} panels.".format(count))
+        t.Commit()
+        _log("\nDone. Placed {0} of {1} panels.".format(count, loaded))
+    except Exception:
+        # CSV errors now surface mid-placement; don't leave the transaction open
+        if t is not None and t.HasStarted() and not t.HasEnded():
+            t.RollBack()
+        raise
+    finally:
+        rows.close()
+        _flush_log()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
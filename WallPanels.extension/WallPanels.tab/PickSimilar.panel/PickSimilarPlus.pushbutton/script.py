@@ -17,13 +17,27 @@ pyRevit tool to select elements similar to a picked element with options:
 
 "Same elevation":
     - |Z - Z_seed| < ELEV_TOL
+
+Performance:
+    - Cost is Revit API round-trips per element, not the float math.
+    - Type and position are pre-filtered natively in the collector
+      (ElementParameterFilter, BoundingBoxIntersectsFilter); Python only
+      checks the few elements that remain.
 """
 
 from pyrevit import revit, DB, forms
 
 from Autodesk.Revit.DB import (
     FilteredElementCollector,
-    ElementId
+    ElementId,
+    BuiltInParameter,
+    ParameterValueProvider,
+    FilterNumericEquals,
+    FilterElementIdRule,
+    ElementParameterFilter,
+    Outline,
+    BoundingBoxIntersectsFilter,
+    LogicalOrFilter
 )
 from Autodesk.Revit.UI.Selection import ObjectType
 
@@ -39,17 +53,21 @@ uidoc = revit.uidoc
 # Internal units are feet. 1" ~ 0.0833 ft
 AXIS_TOL = 0.1   # ~1.2" tolerance for same axis
 ELEV_TOL = 0.1   # ~1.2" tolerance for same elevation
+SLAB_EXTENT = 1e6  # half-size (ft) of the slabs used to pre-filter by position
 
 
 def get_element_center(elem):
-    """Return the center (XYZ) of the element's bounding box in model coords."""
+    """Return the center (x, y, z) of the element's bounding box in model coords.
+
+    A plain float tuple: no XYZ is allocated per candidate element.
+    """
     try:
         bbox = elem.get_BoundingBox(None)
         if not bbox:
             return None
         min_pt = bbox.Min
         max_pt = bbox.Max
-        return DB.XYZ(
+        return (
             0.5 * (min_pt.X + max_pt.X),
             0.5 * (min_pt.Y + max_pt.Y),
             0.5 * (min_pt.Z + max_pt.Z)
@@ -58,39 +76,66 @@ def get_element_center(elem):
         return None
 
 
-def collect_similar_elements(seed):
-    """Collect all elements in the model that are similar to the seed."""
+def _slab_filter(axis, value, tol):
+    """BoundingBoxIntersectsFilter for a thin slab |coord[axis] - value| <= tol."""
+    lo = [-SLAB_EXTENT] * 3
+    hi = [SLAB_EXTENT] * 3
+    lo[axis] = value - tol
+    hi[axis] = value + tol
+    return BoundingBoxIntersectsFilter(Outline(DB.XYZ(*lo), DB.XYZ(*hi)))
+
+
+def build_region_filter(mode, center):
+    """Native pre-filter for the positional modes; None for "Entire model".
+
+    A bbox whose center is within tolerance always touches the slab, so this
+    only drops elements that would fail the exact center test anyway.
+    """
+    sx, sy, sz = center
+    if mode == "Same axis (X/Y)":
+        return LogicalOrFilter(_slab_filter(0, sx, AXIS_TOL), _slab_filter(1, sy, AXIS_TOL))
+    if mode == "Same elevation (Z)":
+        return _slab_filter(2, sz, ELEV_TOL)
+    return None
+
+
+def collect_similar_elements(seed, region_filter=None, ids_only=False):
+    """Collect all elements in the model that are similar to the seed,
+    optionally narrowed by a native region filter.
+
+    ids_only returns ElementIds straight from the collector, without
+    materialising the elements.
+    """
     seed_cat = seed.Category
     seed_typeid = seed.GetTypeId()
 
     if seed_cat is None or seed_typeid == ElementId.InvalidElementId:
         return []
 
+    # Type match runs inside Revit's collector, not per element in Python
+    type_rule = FilterElementIdRule(
+        ParameterValueProvider(ElementId(BuiltInParameter.ELEM_TYPE_PARAM)),
+        FilterNumericEquals(),
+        seed_typeid
+    )
+
     collector = (FilteredElementCollector(doc)
                  .WhereElementIsNotElementType()
-                 .OfCategoryId(seed_cat.Id))
-
-    similar = []
-    for e in collector:
-        try:
-            if e.Id == seed.Id:
-                continue
-            if e.GetTypeId() == seed_typeid:
-                similar.append(e)
-        except Exception:
-            continue
-
-    return similar
+                 .OfCategoryId(seed_cat.Id)
+                 .WherePasses(ElementParameterFilter(type_rule))
+                 .Excluding(List[ElementId]([seed.Id])))
+    if region_filter is not None:
+        collector = collector.WherePasses(region_filter)
 
+    if ids_only:
+        return list(collector.ToElementIds())
+    return list(collector)
 
-def select_elements(elem_list):
-    """Set current selection to the provided elements."""
-    # Need a .NET List[ElementId], not a Python list
-    id_list = List[ElementId]()
-    for e in elem_list:
-        id_list.Add(e.Id)
 
-    uidoc.Selection.SetElementIds(id_list)
+def select_element_ids(ids):
+    """Set current selection to the provided element ids."""
+    # Need a .NET List[ElementId], not a Python list; built in one call
+    uidoc.Selection.SetElementIds(List[ElementId](ids))
 
 
 def main():
@@ -135,44 +180,48 @@ def main():
     # ----------------------------
     # 3) Collect similar elements
     # ----------------------------
-    similar_elems = collect_similar_elements(seed)
+    region_filter = build_region_filter(mode, seed_center)
+    # "Entire model" never looks at the elements, so it only asks for their ids
+    similar_elems = collect_similar_elements(seed, region_filter,
+                                             ids_only=(mode == "Entire model"))
 
     if not similar_elems:
-        forms.alert("No similar elements found in the model.", exitscript=True)
+        if region_filter is None:
+            forms.alert("No similar elements found in the model.", exitscript=True)
+        forms.alert("No similar elements found for the chosen condition.", exitscript=True)
 
     # ----------------------------
     # 4) Filter based on mode
     # ----------------------------
     if mode == "Entire model":
         # Include the seed as well to make it clear
-        final_selection = [seed] + similar_elems
+        final_ids = [seed.Id] + similar_elems
 
     else:
+        # Pick the test once, not per element
+        sx, sy, sz = seed_center
+        if mode == "Same axis (X/Y)":
+            def keep(c):
+                return abs(c[0] - sx) < AXIS_TOL or abs(c[1] - sy) < AXIS_TOL
+        else:  # "Same elevation (Z)"
+            def keep(c):
+                return abs(c[2] - sz) < ELEV_TOL
+
         filtered = []
         for e in similar_elems:
             c = get_element_center(e)
-            if c is None:
-                continue
-
-            if mode == "Same axis (X/Y)":
-                same_x = abs(c.X - seed_center.X) < AXIS_TOL
-                same_y = abs(c.Y - seed_center.Y) < AXIS_TOL
-                if same_x or same_y:
-                    filtered.append(e)
-
-            elif mode == "Same elevation (Z)":
-                if abs(c.Z - seed_center.Z) < ELEV_TOL:
-                    filtered.append(e)
+            if c is not None and keep(c):
+                filtered.append(e)
 
         if not filtered:
             forms.alert("No similar elements found for the chosen condition.", exitscript=True)
 
-        final_selection = [seed] + filtered
+        final_ids = [seed.Id] + [e.Id for e in filtered]
 
     # ----------------------------
     # 5) Apply selection
     # ----------------------------
-    select_elements(final_selection)
+    select_element_ids(final_ids)
 
 
 if __name__ == "__main__":
@@ -7,18 +7,16 @@ User selects one panel, script finds all panels and exports their current state
 from Autodesk.Revit.DB import (
     FilteredElementCollector, Wall, Transaction, XYZ, Line,
     FamilySymbol, BuiltInCategory, BuiltInParameter, ElementId,
-    DirectShape, Options, GeometryElement
+    DirectShape, GeometryElement, Outline, BoundingBoxIntersectsFilter
 )
 from Autodesk.Revit.UI import TaskDialog, TaskDialogCommonButtons
 from pyrevit import revit, forms
 import csv
+import io
 import os
 import json
 
 import clr
-clr.AddReference('System.Windows.Forms')
-clr.AddReference('System.Drawing')
-from System.Windows.Forms import SaveFileDialog, DialogResult
 
 doc = revit.doc
 uidoc = revit.uidoc
@@ -27,6 +25,23 @@ uidoc = revit.uidoc
 # Default location for saving
 DEFAULT_OUTPUT_DIR = r"C:\Users\byucel\OneDrive - RNGD\Desktop\revit_walls"
 
+# Max distance (ft) from a wall's location line for a panel to count as on it
+NEAR_WALL_TOL = 2.0
+
+# Exports with fewer panels than this are built in memory and written at once;
+# larger ones stream to disk, flushing every FLUSH_EVERY rows
+IN_MEMORY_MAX_ROWS = 5000
+FLUSH_EVERY = 1000
+
+# Write buffer for the CSV export; keeps syscalls (and OneDrive sync hops) down
+CSV_BUFFER_BYTES = 1 << 20
+
+# CSV columns; extract_panel_info_from_element returns rows in this order
+CSV_FIELDS = (
+    "panel_name", "panel_type", "wall_id", "element_id",
+    "x_in", "y_in", "width_in", "height_in", "area_in2"
+)
+
 
 def _pick_save_csv_path(default_dir, default_name):
     """
@@ -34,6 +49,10 @@ def _pick_save_csv_path(default_dir, default_name):
     Returns full path or None if cancelled.
     """
     try:
+        # WinForms is only loaded once the export actually reaches the save step
+        clr.AddReference('System.Windows.Forms')
+        from System.Windows.Forms import SaveFileDialog, DialogResult
+        
         dlg = SaveFileDialog()
         dlg.Filter = "CSV files (*.csv)|*.csv|All files (*.*)|*.*"
         dlg.Title = "Save updated panel information"
@@ -70,38 +89,125 @@ def _pick_save_csv_path(default_dir, default_name):
         return None
 
 
-def get_host_wall(element):
+def _box_tuple(bbox):
+    """(min_x, min_y, min_z, max_x, max_y, max_z) of a BoundingBoxXYZ, or None."""
+    if not bbox:
+        return None
+    mn, mx = bbox.Min, bbox.Max
+    return (mn.X, mn.Y, mn.Z, mx.X, mx.Y, mx.Z)
+
+
+# Collected once per run by _collect_scene():
+#   walls       - [(wall, location curve, box or None)]
+#   wall_curves - {wall id: (location curve, box or None)}
+# Boxes are _box_tuple() tuples, so later lookups do not go back to the API.
+_SCENE = None
+
+def _collect_scene():
+    """Walk the wall collector once; return (walls, wall_curves)."""
+    global _SCENE
+    if _SCENE is None:
+        walls = []
+        wall_curves = {}
+        for wall in FilteredElementCollector(doc).OfClass(Wall):
+            loc = wall.Location
+            if not hasattr(loc, 'Curve'):
+                continue
+            curve = loc.Curve
+            box = _box_tuple(wall.get_BoundingBox(None))
+            walls.append((wall, curve, box))
+            wall_curves[wall.Id.IntegerValue] = (curve, box)
+        
+        _SCENE = (walls, wall_curves)
+    return _SCENE
+
+
+def _panel_entries(collector):
+    """(panel, name, box or None, center or None) for each non-cutout DirectShape."""
+    panels = []
+    for ds in collector:
+        name = ds.Name
+        # Skip cutouts
+        if not name or name.startswith("Cutout_"):
+            continue
+        box = _box_tuple(ds.get_BoundingBox(None))
+        center = None
+        if box:
+            center = XYZ((box[0] + box[3]) * 0.5, (box[1] + box[4]) * 0.5,
+                         (box[2] + box[5]) * 0.5)
+        panels.append((ds, name, box, center))
+    return panels
+
+
+# Every non-cutout DirectShape; only needed when no host wall is found
+_ALL_PANELS = None
+
+def _get_all_panels():
+    global _ALL_PANELS
+    if _ALL_PANELS is None:
+        _ALL_PANELS = _panel_entries(FilteredElementCollector(doc).OfClass(DirectShape))
+    return _ALL_PANELS
+
+
+_WALL_TYPE = clr.GetClrType(Wall)
+
+
+def get_host_wall(element, scene=None):
     """Try to find the wall that hosts this element."""
     try:
-        # Try to get host
-        if hasattr(element, 'Host'):
+        # The picked element may be the wall itself
+        if _WALL_TYPE.IsInstanceOfType(element):
+            return element
+        
+        # Try to get host (one property read; hasattr would read it twice)
+        try:
             host = element.Host
-            if isinstance(host, Wall):
-                return host
+        except AttributeError:
+            host = None
+        if host is not None and _WALL_TYPE.IsInstanceOfType(host):
+            # Revit already knows the wall; no spatial search needed
+            return host
         
-        # Alternative: check bounding box and find nearest wall
+        # No wall host (none at all, or e.g. a level): find nearest wall
         bbox = element.get_BoundingBox(None)
         if bbox:
             center = (bbox.Min + bbox.Max) * 0.5
             
             # Find walls near this point
-            walls = FilteredElementCollector(doc).OfClass(Wall).ToElements()
+            cx, cy = center.X, center.Y
+            tol = NEAR_WALL_TOL
             min_dist = float('inf')
             nearest_wall = None
             
-            for wall in walls:
-                loc = wall.Location
-                if hasattr(loc, 'Curve'):
-                    curve = loc.Curve
-                    # Get distance from center to wall curve
-                    result = curve.Project(center)
-                    if result:
-                        dist = result.Distance
-                        if dist < min_dist:
-                            min_dist = dist
-                            nearest_wall = wall
+            candidates = []
+            for i, (wall, curve, box) in enumerate((scene or _collect_scene())[0]):
+                if box is None:
+                    candidates.append((0.0, i, wall, curve))
+                    continue
+                # Plan distance to the wall's box: the location curve lies inside
+                # the box, so the curve is never closer than this
+                dx = max(box[0] - cx, 0.0, cx - box[3])
+                dy = max(box[1] - cy, 0.0, cy - box[4])
+                bound = (dx * dx + dy * dy) ** 0.5
+                # Cheap plan-box reject before the Project call
+                if bound >= tol:
+                    continue
+                candidates.append((bound, i, wall, curve))
+            candidates.sort()
+            
+            for bound, _, wall, curve in candidates:
+                # Every remaining wall is at least this far away: none can be nearer
+                if bound >= min_dist:
+                    break
+                # Get distance from center to wall curve
+                result = curve.Project(center)
+                if result:
+                    dist = result.Distance
+                    if dist < min_dist:
+                        min_dist = dist
+                        nearest_wall = wall
             
-            if min_dist < 2.0:  # Within 2 feet
+            if min_dist < NEAR_WALL_TOL:  # Within 2 feet
                 return nearest_wall
         
         return None
@@ -111,97 +217,141 @@ def get_host_wall(element):
         return None
 
 
-def get_all_directshapes_near_wall(wall):
-    """Get all DirectShape elements near the specified wall."""
+def _segment(line):
+    """(start x, y, z, unit dir x, y, z, length) of a bound Line, or None if degenerate."""
+    p0, p1 = line.GetEndPoint(0), line.GetEndPoint(1)
+    sx, sy, sz = p0.X, p0.Y, p0.Z
+    dx, dy, dz = p1.X - sx, p1.Y - sy, p1.Z - sz
+    length = (dx * dx + dy * dy + dz * dz) ** 0.5
+    if length < 1e-9:
+        return None
+    return (sx, sy, sz, dx / length, dy / length, dz / length, length)
+
+
+def _segment_dist_sq(seg, x, y, z):
+    """Squared distance from a point to the segment; matches Line.Project on a bound line."""
+    sx, sy, sz, ux, uy, uz, length = seg
+    vx, vy, vz = x - sx, y - sy, z - sz
+    t = vx * ux + vy * uy + vz * uz
+    if t < 0.0:
+        t = 0.0
+    elif t > length:
+        t = length
+    ex, ey, ez = vx - ux * t, vy - uy * t, vz - uz * t
+    return ex * ex + ey * ey + ez * ez
+
+
+def get_all_directshapes_near_wall(wall, scene=None):
+    """
+    Get all DirectShape elements near the specified wall.
+    Returns (panel, name, box, center) entries.
+    """
     if not wall:
         # If no wall, get all DirectShapes
-        collector = FilteredElementCollector(doc).OfClass(DirectShape)
-        return [ds for ds in collector if ds.Name and not ds.Name.startswith("Cutout_")]
+        return list(_get_all_panels())
     
     try:
-        # Get wall location
-        loc_curve = wall.Location.Curve
-        wall_start = loc_curve.GetEndPoint(0)
-        wall_end = loc_curve.GetEndPoint(1)
-        
-        # Get all DirectShapes
-        collector = FilteredElementCollector(doc).OfClass(DirectShape)
+        # Get wall location (cached unless the wall came from element.Host)
+        cached = (scene or _collect_scene())[1].get(wall.Id.IntegerValue)
+        if cached:
+            loc_curve, box = cached
+        else:
+            loc_curve = wall.Location.Curve
+            box = _box_tuple(wall.get_BoundingBox(None))
+        
+        # Extent of the wall, grown by the tolerance
+        if not box:
+            p0, p1 = loc_curve.GetEndPoint(0), loc_curve.GetEndPoint(1)
+            box = (min(p0.X, p1.X), min(p0.Y, p1.Y), min(p0.Z, p1.Z),
+                   max(p0.X, p1.X), max(p0.Y, p1.Y), max(p0.Z, p1.Z))
+        tol = NEAR_WALL_TOL
+        outline = Outline(XYZ(box[0] - tol, box[1] - tol, box[2] - tol),
+                          XYZ(box[3] + tol, box[4] + tol, box[5] + tol))
+        
+        # Straight walls are measured in plain floats; arcs go through Project
+        seg = _segment(loc_curve) if isinstance(loc_curve, Line) else None
+        tol_sq = tol * tol
+        
+        # Revit rejects DirectShapes outside the outline natively;
+        # only the ones it passes need the distance test
+        collector = (FilteredElementCollector(doc)
+                     .OfClass(DirectShape)
+                     .WherePasses(BoundingBoxIntersectsFilter(outline)))
         nearby_panels = []
-        
-        for ds in collector:
-            name = ds.Name
-            # Skip cutouts
-            if not name or name.startswith("Cutout_"):
+        for entry in _panel_entries(collector):
+            pbox, center = entry[2], entry[3]
+            if center is None:
                 continue
-            
-            # Check if near the wall
-            bbox = ds.get_BoundingBox(None)
-            if bbox:
-                center = (bbox.Min + bbox.Max) * 0.5
+            if seg:
+                near = _segment_dist_sq(seg, (pbox[0] + pbox[3]) * 0.5,
+                                        (pbox[1] + pbox[4]) * 0.5,
+                                        (pbox[2] + pbox[5]) * 0.5) < tol_sq
+            else:
                 result = loc_curve.Project(center)
-                if result and result.Distance < 2.0:  # Within 2 feet
-                    nearby_panels.append(ds)
+                near = result and result.Distance < tol
+            if near:  # Within 2 feet
+                nearby_panels.append(entry)
         
         return nearby_panels
         
     except Exception as e:
         print("Error finding panels near wall: {}".format(str(e)))
         # Fallback: return all DirectShapes
-        collector = FilteredElementCollector(doc).OfClass(DirectShape)
-        return [ds for ds in collector if ds.Name and not ds.Name.startswith("Cutout_")]
+        return list(_get_all_panels())
 
 
-def extract_panel_info_from_element(panel_element, wall=None):
-    """Extract current dimensions and position from a placed panel."""
+def extract_panel_info_from_element(panel_element, wall=None, box=None, name=None,
+                                    wall_id=None):
+    """
+    Extract current dimensions and position from a placed panel as a CSV_FIELDS row.
+    box/name/wall_id may be passed in from the collected scene to skip the API reads.
+    """
     try:
-        # Get the geometry
-        options = Options()
-        geom = panel_element.get_Geometry(options)
-        
-        if not geom:
+        # Get bounding box to determine dimensions (an element without
+        # geometry has no bounding box, so this also covers that check)
+        if box is None:
+            box = _box_tuple(panel_element.get_BoundingBox(None))
+        if not box:
             return None
         
-        # Get bounding box to determine dimensions
-        bbox = panel_element.get_BoundingBox(None)
-        if not bbox:
-            return None
-        
-        min_pt = bbox.Min
-        max_pt = bbox.Max
+        min_x, min_y, min_z, max_x, max_y, max_z = box
         
         # Calculate dimensions
-        width_ft = abs(max_pt.X - min_pt.X)
-        height_ft = abs(max_pt.Z - min_pt.Z)
-        depth_ft = abs(max_pt.Y - min_pt.Y)
+        width_ft = abs(max_x - min_x)
+        height_ft = abs(max_z - min_z)
+        depth_ft = abs(max_y - min_y)
         
-        # Use the two largest dimensions
-        dims = sorted([width_ft, height_ft, depth_ft], reverse=True)
-        width_ft = dims[0]
-        height_ft = dims[1]
+        # Use the two largest dimensions (largest, then the middle one)
+        largest = max(width_ft, height_ft, depth_ft)
+        height_ft = max(min(width_ft, height_ft),
+                        min(max(width_ft, height_ft), depth_ft))
+        width_ft = largest
         
         width_in = width_ft * 12.0
         height_in = height_ft * 12.0
         
         # Position
-        x_in = min_pt.X * 12.0
-        y_in = min_pt.Z * 12.0
+        x_in = min_x * 12.0
+        y_in = min_z * 12.0
         
         # Wall info
-        wall_id = ""
-        if wall:
-            wall_id = str(wall.Id.IntegerValue)
-        
-        panel_data = {
-            "panel_name": panel_element.Name or "Panel",
-            "panel_type": "{}x{}".format(int(round(width_in)), int(round(height_in))),
-            "wall_id": wall_id,
-            "element_id": str(panel_element.Id.IntegerValue),
-            "x_in": round(x_in, 2),
-            "y_in": round(y_in, 2),
-            "width_in": round(width_in, 2),
-            "height_in": round(height_in, 2),
-            "area_in2": round(width_in * height_in, 2),
-        }
+        if wall_id is None:
+            wall_id = str(wall.Id.IntegerValue) if wall else ""
+        if name is None:
+            name = panel_element.Name
+        
+        # Same order as CSV_FIELDS
+        panel_data = (
+            name or "Panel",
+            "{}x{}".format(int(round(width_in)), int(round(height_in))),
+            wall_id,
+            str(panel_element.Id.IntegerValue),
+            round(x_in, 2),
+            round(y_in, 2),
+            round(width_in, 2),
+            round(height_in, 2),
+            round(width_in * height_in, 2),
+        )
         
         return panel_data
         
@@ -211,6 +361,35 @@ def extract_panel_info_from_element(panel_element, wall=None):
         return None
 
 
+def _iter_panel_rows(all_panels, host_wall):
+    """Yield a CSV row per panel; a panel that fails is logged and skipped."""
+    wall_id = str(host_wall.Id.IntegerValue) if host_wall else ""
+    for panel, name, box, _ in all_panels:
+        try:
+            panel_data = extract_panel_info_from_element(
+                panel, host_wall, box, name, wall_id)
+        except Exception as e:
+            print("Skipping panel {}: {}".format(
+                panel.Id.IntegerValue, str(e)))
+            continue
+        if panel_data:
+            yield panel_data
+
+
+def _write_rows(out, first_row, rows, flush_every=0):
+    """Write the header and all rows to out; flush every flush_every rows if set. Returns the row count."""
+    writer = csv.writer(out)
+    writer.writerow(CSV_FIELDS)
+    writer.writerow(first_row)
+    count = 1
+    for panel_data in rows:
+        writer.writerow(panel_data)
+        count += 1
+        if flush_every and count % flush_every == 0:
+            out.flush()
+    return count
+
+
 def export_panels_from_selection():
     """Let user select one panel, then export all panels on same wall."""
     
@@ -238,8 +417,11 @@ def export_panels_from_selection():
         print("Selected element: {} (ID: {})".format(
             selected_elem.Name, selected_elem.Id.IntegerValue))
         
+        # Walls are collected once and shared by both lookups
+        scene = _collect_scene()
+        
         # Find the wall this panel is on
-        host_wall = get_host_wall(selected_elem)
+        host_wall = get_host_wall(selected_elem, scene)
         
         if host_wall:
             print("Found host wall: {} (ID: {})".format(
@@ -248,7 +430,7 @@ def export_panels_from_selection():
             print("No host wall found, will export all panels")
         
         # Get all panels on this wall (or all panels if no wall found)
-        all_panels = get_all_directshapes_near_wall(host_wall)
+        all_panels = get_all_directshapes_near_wall(host_wall, scene)
         
         print("Found {} total panels".format(len(all_panels)))
         
@@ -265,19 +447,15 @@ def export_panels_from_selection():
             print("Export cancelled by user")
             return
         
-        # Extract info from each panel
-        all_rows = []
-        for panel in all_panels:
-            panel_data = extract_panel_info_from_element(panel, host_wall)
-            if panel_data:
-                all_rows.append(panel_data)
+        # Rows are extracted lazily; pull the first one before any file is
+        # chosen or opened, so a failed extraction never touches the disk
+        rows = _iter_panel_rows(all_panels, host_wall)
+        first_row = next(rows, None)
         
-        if not all_rows:
+        if first_row is None:
             forms.alert("Could not extract information from panels!")
             return
         
-        print("Successfully extracted info from {} panels".format(len(all_rows)))
-        
         # Ask user where to save
         output_path = _pick_save_csv_path(DEFAULT_OUTPUT_DIR, "updated_panel_info.csv")
         
@@ -285,22 +463,22 @@ def export_panels_from_selection():
             forms.alert("Export cancelled.")
             return
         
-        # Define CSV columns
-        fieldnames = [
-            "panel_name", "panel_type", "wall_id", "element_id",
-            "x_in", "y_in", "width_in", "height_in", "area_in2"
-        ]
-        
-        # Write CSV
+        # Small exports are assembled in memory first and then written in one
+        # call; larger ones stream to the file as rows are extracted
         try:
-            with open(output_path, "w", newline='') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(all_rows)
+            if len(all_panels) < IN_MEMORY_MAX_ROWS:
+                out = io.StringIO(newline='')
+                count = _write_rows(out, first_row, rows)
+                with io.open(output_path, "w", newline='') as f:
+                    f.write(out.getvalue())
+            else:
+                with io.open(output_path, "w", newline='', buffering=CSV_BUFFER_BYTES) as f:
+                    count = _write_rows(f, first_row, rows, FLUSH_EVERY)
             
+            print("Successfully extracted info from {} panels".format(count))
             forms.alert(
                 "✓ Successfully exported {} panels to:\n{}".format(
-                    len(all_rows), output_path
+                    count, output_path
                 )
             )
             print("Successfully exported to: {}".format(output_path))